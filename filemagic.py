@@ -0,0 +1,520 @@
+import struct
+import zipfile
+from collections import namedtuple
+
+HEAD_BYTES = 512
+KEY_LEN = 2
+MIMETYPE_MAX = 256
+
+FileType = namedtuple("FileType", "name desc mime exts kind")
+
+TYPES = {
+    # imagen
+    "jpeg": ("JPEG", "image/jpeg", "jpg jpeg jpe jfif", "image"),
+    "png": ("PNG", "image/png", "png apng", "image"),
+    "gif": ("GIF", "image/gif", "gif", "image"),
+    "bmp": ("Bitmap", "image/bmp", "bmp dib", "image"),
+    "tiff": ("TIFF", "image/tiff", "tif tiff nef dng arw nrw pef srw orf rw2 3fr erf k25 kdc", "image"),
+    "cr2": ("Canon RAW 2", "image/x-canon-cr2", "cr2", "image"),
+    "cr3": ("Canon RAW 3", "image/x-canon-cr3", "cr3", "image"),
+    "orf": ("Olympus RAW", "image/x-olympus-orf", "orf", "image"),
+    "rw2": ("Panasonic RAW", "image/x-panasonic-rw2", "rw2", "image"),
+    "raf": ("Fujifilm RAF", "image/x-fuji-raf", "raf", "image"),
+    "webp": ("WebP", "image/webp", "webp", "image"),
+    "heic": ("HEIF/HEIC", "image/heic", "heic heif hif", "image"),
+    "avif": ("AVIF", "image/avif", "avif", "image"),
+    "ico": ("Icono Windows", "image/x-icon", "ico", "image"),
+    "cur": ("Cursor Windows", "image/x-win-bitmap", "cur", "image"),
+    "ani": ("Cursor animado", "application/x-navi-animation", "ani", "image"),
+    "psd": ("Photoshop", "image/vnd.adobe.photoshop", "psd psb", "image"),
+    "jp2": ("JPEG 2000", "image/jp2", "jp2 j2k jpf jpx jpm", "image"),
+    "jxl": ("JPEG XL", "image/jxl", "jxl", "image"),
+    "xcf": ("GIMP XCF", "image/x-xcf", "xcf", "image"),
+    "exr": ("OpenEXR", "image/x-exr", "exr", "image"),
+    "bpg": ("BPG", "image/bpg", "bpg", "image"),
+    "flif": ("FLIF", "image/flif", "flif", "image"),
+    "qoi": ("QOI", "image/qoi", "qoi", "image"),
+    "dds": ("DirectDraw Surface", "image/vnd-ms.dds", "dds", "image"),
+    "ktx": ("KTX", "image/ktx", "ktx", "image"),
+    "djvu": ("DjVu", "image/vnd.djvu", "djvu djv", "document"),
+    "wmf": ("Windows Metafile", "image/wmf", "wmf", "image"),
+    "emf": ("Enhanced Metafile", "image/emf", "emf", "image"),
+    "fits": ("FITS", "image/fits", "fits fit fts", "image"),
+    "dicom": ("DICOM", "application/dicom", "dcm dicom", "image"),
+    "dpx": ("DPX", "image/x-dpx", "dpx", "image"),
+    "iff": ("IFF ILBM", "image/x-ilbm", "iff lbm ilbm", "image"),
+    "cdr": ("CorelDRAW", "application/vnd.corel-draw", "cdr", "image"),
+    # audio / video
+    "mp3": ("MP3", "audio/mpeg", "mp3", "audio"),
+    "aac": ("AAC ADTS", "audio/aac", "aac", "audio"),
+    "flac": ("FLAC", "audio/flac", "flac", "audio"),
+    "ogg": ("Ogg", "audio/ogg", "ogg oga ogv ogx opus spx", "audio"),
+    "wav": ("WAVE", "audio/wav", "wav wave", "audio"),
+    "aiff": ("AIFF", "audio/aiff", "aif aiff aifc", "audio"),
+    "midi": ("MIDI", "audio/midi", "mid midi", "audio"),
+    "rmi": ("RIFF MIDI", "audio/mid", "rmi", "audio"),
+    "amr": ("AMR", "audio/amr", "amr", "audio"),
+    "ape": ("Monkey's Audio", "audio/ape", "ape", "audio"),
+    "wv": ("WavPack", "audio/wavpack", "wv", "audio"),
+    "au": ("Sun Audio", "audio/basic", "au snd", "audio"),
+    "m4a": ("MPEG-4 Audio", "audio/mp4", "m4a m4b m4p m4r mp4", "audio"),
+    "mp4": ("MPEG-4", "video/mp4", "mp4 m4v mov 3gp 3g2 f4v f4a mp4v", "video"),
+    "mov": ("QuickTime", "video/quicktime", "mov qt mp4", "video"),
+    "3gp": ("3GPP", "video/3gpp", "3gp 3g2 3gpp mp4", "video"),
+    "mkv": ("Matroska/WebM", "video/x-matroska", "mkv mka mks mk3d webm", "video"),
+    "avi": ("AVI", "video/x-msvideo", "avi", "video"),
+    "flv": ("Flash Video", "video/x-flv", "flv", "video"),
+    "asf": ("ASF/WMV", "video/x-ms-asf", "asf wmv wma", "video"),
+    "mpeg": ("MPEG PS", "video/mpeg", "mpg mpeg m2p vob", "video"),
+    "rm": ("RealMedia", "application/vnd.rn-realmedia", "rm rmvb ra", "video"),
+    "swf": ("Flash SWF", "application/x-shockwave-flash", "swf", "video"),
+    # documentos
+    "pdf": ("PDF", "application/pdf", "pdf ai", "pdf"),
+    "ps": ("PostScript", "application/postscript", "ps eps epsf ai", "document"),
+    "epsbin": ("EPS binario", "application/postscript", "eps epsf", "document"),
+    "rtf": ("RTF", "application/rtf", "rtf", "document"),
+    "ole": ("OLE2 (Office 97-2003)", "application/x-ole-storage", "doc dot xls xlt xla ppt pot pps msg msi msp mst vsd wps hwp one", "document"),
+    "ooxml": ("Office Open XML", "application/vnd.openxmlformats-officedocument", "docx docm dotx dotm xlsx xlsm xltx xltm xlam pptx pptm potx potm ppsx ppsm vsdx", "office"),
+    "docx": ("Word OOXML", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", "docx docm dotx dotm", "office"),
+    "xlsx": ("Excel OOXML", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx xlsm xltx xltm xlam", "office"),
+    "pptx": ("PowerPoint OOXML", "application/vnd.openxmlformats-officedocument.presentationml.presentation", "pptx pptm potx potm ppsx ppsm", "office"),
+    "vsdx": ("Visio OOXML", "application/vnd.ms-visio.drawing", "vsdx vsdm", "office"),
+    "xps": ("XPS", "application/oxps", "xps oxps", "document"),
+    "odt": ("OpenDocument Texto", "application/vnd.oasis.opendocument.text", "odt ott", "document"),
+    "ods": ("OpenDocument Hoja", "application/vnd.oasis.opendocument.spreadsheet", "ods ots", "document"),
+    "odp": ("OpenDocument Presentacion", "application/vnd.oasis.opendocument.presentation", "odp otp", "document"),
+    "odg": ("OpenDocument Dibujo", "application/vnd.oasis.opendocument.graphics", "odg otg", "document"),
+    "epub": ("EPUB", "application/epub+zip", "epub", "document"),
+    "mobi": ("Mobipocket", "application/x-mobipocket-ebook", "mobi prc azw", "document"),
+    "lit": ("Microsoft Reader", "application/x-ms-reader", "lit", "document"),
+    "chm": ("Ayuda HTML compilada", "application/vnd.ms-htmlhelp", "chm", "document"),
+    "wpd": ("WordPerfect", "application/vnd.wordperfect", "wpd wp wp5 wp6", "document"),
+    "indd": ("InDesign", "application/x-indesign", "indd", "document"),
+    "onenote": ("OneNote", "application/onenote", "one", "document"),
+    "xml": ("XML", "application/xml", "xml svg xsd xsl xslt rss atom kml gpx plist xaml config", "text"),
+    "html": ("HTML", "text/html", "html htm xhtml", "text"),
+    "script": ("Script", "text/x-script", "sh bash zsh ksh py pl rb php js tcl awk", "text"),
+    "pem": ("PEM", "application/x-pem-file", "pem crt cer key csr pub", "text"),
+    "pgp": ("PGP ASCII", "application/pgp-encrypted", "asc pgp gpg sig", "text"),
+    "vcard": ("vCard", "text/vcard", "vcf vcard", "text"),
+    "ical": ("iCalendar", "text/calendar", "ics ical ifb", "text"),
+    "warc": ("WARC", "application/warc", "warc", "text"),
+    "vault": ("Ansible Vault", "text/x-ansible-vault", "vault", "text"),
+    # comprimidos
+    "zip": ("ZIP", "application/zip", "zip zipx jar war ear apk aab xpi nupkg whl ipa kmz kra sketch 3mf usdz appx msix vsix docx docm dotx dotm xlsx xlsm xltx xltm xlam pptx pptm potx potm ppsx ppsm vsdx vsdm xps oxps odt ott ods ots odp otp odg otg epub", "archive"),
+    "jar": ("Java JAR", "application/java-archive", "jar war ear", "archive"),
+    "apk": ("Android APK", "application/vnd.android.package-archive", "apk aab", "archive"),
+    "gzip": ("GZIP", "application/gzip", "gz tgz gzip svgz", "archive"),
+    "bzip2": ("BZIP2", "application/x-bzip2", "bz2 tbz tbz2", "archive"),
+    "xz": ("XZ", "application/x-xz", "xz txz", "archive"),
+    "7z": ("7-Zip", "application/x-7z-compressed", "7z", "archive"),
+    "rar": ("RAR", "application/vnd.rar", "rar", "archive"),
+    "tar": ("TAR", "application/x-tar", "tar", "archive"),
+    "zstd": ("Zstandard", "application/zstd", "zst tzst", "archive"),
+    "lz4": ("LZ4", "application/x-lz4", "lz4", "archive"),
+    "lzip": ("Lzip", "application/x-lzip", "lz", "archive"),
+    "compress": ("Unix compress", "application/x-compress", "z taz", "archive"),
+    "cab": ("Microsoft CAB", "application/vnd.ms-cab-compressed", "cab", "archive"),
+    "iscab": ("InstallShield CAB", "application/x-installshield", "cab", "archive"),
+    "arj": ("ARJ", "application/x-arj", "arj", "archive"),
+    "lzh": ("LHA", "application/x-lzh-compressed", "lzh lha", "archive"),
+    "zoo": ("ZOO", "application/x-zoo", "zoo", "archive"),
+    "cpio": ("CPIO", "application/x-cpio", "cpio", "archive"),
+    "deb": ("Paquete Debian", "application/vnd.debian.binary-package", "deb udeb", "archive"),
+    "ar": ("Archivo ar", "application/x-archive", "a ar lib", "archive"),
+    "rpm": ("RPM", "application/x-rpm", "rpm", "archive"),
+    "xar": ("XAR", "application/x-xar", "xar pkg", "archive"),
+    "crx": ("Extension Chrome", "application/x-chrome-extension", "crx", "archive"),
+    "wim": ("Windows Imaging", "application/x-ms-wim", "wim esd swm", "archive"),
+    "squashfs": ("SquashFS", "application/x-squashfs", "sqsh squashfs sfs snap", "disk"),
+    "vmdk": ("VMDK", "application/x-vmdk", "vmdk", "disk"),
+    "vhd": ("VHD", "application/x-vhd", "vhd", "disk"),
+    "vhdx": ("VHDX", "application/x-vhdx", "vhdx avhdx", "disk"),
+    "qcow": ("QCOW", "application/x-qemu-disk", "qcow qcow2", "disk"),
+    "vdi": ("VirtualBox VDI", "application/x-virtualbox-vdi", "vdi", "disk"),
+    "luks": ("LUKS", "application/x-luks", "luks", "disk"),
+    "bitlocker": ("BitLocker", "application/x-bitlocker", "bek", "disk"),
+    # ejecutables
+    "pe": ("Ejecutable Windows (PE)", "application/vnd.microsoft.portable-executable", "exe dll sys scr ocx cpl drv efi mui ax tlb", "executable"),
+    "elf": ("Ejecutable ELF", "application/x-elf", "elf so o ko axf", "executable"),
+    "macho": ("Mach-O", "application/x-mach-binary", "dylib bundle macho", "executable"),
+    "fat": ("Mach-O universal / Java class", "application/x-mach-binary", "class dylib bundle", "executable"),
+    "dex": ("Dalvik DEX", "application/vnd.android.dex", "dex odex", "executable"),
+    "wasm": ("WebAssembly", "application/wasm", "wasm", "executable"),
+    "luac": ("Lua bytecode", "application/x-lua-bytecode", "luac", "executable"),
+    "lnk": ("Acceso directo Windows", "application/x-ms-shortcut", "lnk", "executable"),
+    "jser": ("Java serializado", "application/x-java-serialized-object", "ser", "executable"),
+    # datos / forense
+    "sqlite": ("SQLite 3", "application/vnd.sqlite3", "sqlite sqlite3 db3 s3db sl3", "database"),
+    "mdb": ("Access MDB", "application/x-msaccess", "mdb mde", "database"),
+    "accdb": ("Access ACCDB", "application/msaccess", "accdb accde", "database"),
+    "ese": ("ESE (JET Blue)", "application/x-ese", "edb", "database"),
+    "pst": ("Outlook PST/OST", "application/vnd.ms-outlook", "pst ost", "database"),
+    "kdbx": ("KeePass", "application/x-keepass2", "kdbx kdb", "database"),
+    "regf": ("Registro Windows", "application/x-ms-registry", "hiv hve", "database"),
+    "evtx": ("Eventos Windows (EVTX)", "application/x-ms-evtx", "evtx", "database"),
+    "evt": ("Eventos Windows (EVT)", "application/x-ms-evt", "evt", "database"),
+    "prefetch": ("Prefetch Windows", "application/x-ms-prefetch", "pf", "database"),
+    "minidump": ("Minidump", "application/x-dmp", "dmp mdmp", "database"),
+    "pcap": ("PCAP", "application/vnd.tcpdump.pcap", "pcap cap", "database"),
+    "pcapng": ("PCAPNG", "application/x-pcapng", "pcapng ntar", "database"),
+    "bplist": ("Plist binario", "application/x-bplist", "plist bplist", "database"),
+    "parquet": ("Parquet", "application/vnd.apache.parquet", "parquet", "database"),
+    "avro": ("Avro", "application/avro", "avro", "database"),
+    "orc": ("ORC", "application/x-orc", "orc", "database"),
+    "hdf5": ("HDF5", "application/x-hdf5", "h5 hdf5 he5", "database"),
+    "netcdf": ("NetCDF", "application/x-netcdf", "nc cdf", "database"),
+    "arrow": ("Arrow/Feather", "application/vnd.apache.arrow.file", "arrow feather", "database"),
+    "npy": ("NumPy", "application/x-npy", "npy", "database"),
+    "pickle": ("Python pickle", "application/x-python-pickle", "pkl pickle", "database"),
+    "mat": ("MATLAB", "application/x-matlab-data", "mat", "database"),
+    "gitpack": ("Git pack", "application/x-git", "pack", "database"),
+    "torrent": ("BitTorrent", "application/x-bittorrent", "torrent", "database"),
+    "jks": ("Java KeyStore", "application/x-java-keystore", "jks keystore", "crypto"),
+    "openssl": ("OpenSSL cifrado", "application/x-openssl-enc", "enc", "crypto"),
+    "age": ("age cifrado", "application/x-age-encryption", "age", "crypto"),
+    # fuentes / 3D
+    "ttf": ("TrueType", "font/ttf", "ttf tte", "font"),
+    "otf": ("OpenType", "font/otf", "otf", "font"),
+    "ttc": ("Coleccion TrueType", "font/collection", "ttc", "font"),
+    "woff": ("WOFF", "font/woff", "woff", "font"),
+    "woff2": ("WOFF2", "font/woff2", "woff2", "font"),
+    "blend": ("Blender", "application/x-blender", "blend", "model"),
+    "fbx": ("FBX", "application/vnd.autodesk.fbx", "fbx", "model"),
+    "glb": ("glTF binario", "model/gltf-binary", "glb", "model"),
+    "dwg": ("AutoCAD DWG", "image/vnd.dwg", "dwg", "model"),
+}
+
+SIGNATURES = [
+    ("jpeg", ((0, b"\xff\xd8\xff"),)),
+    ("png", ((0, b"\x89PNG\r\n\x1a\n"),)),
+    ("gif", ((0, b"GIF87a"),)),
+    ("gif", ((0, b"GIF89a"),)),
+    ("bmp", ((0, b"BM"), (6, b"\x00\x00\x00\x00"))),
+    ("tiff", ((0, b"II*\x00"),)),
+    ("tiff", ((0, b"MM\x00*"),)),
+    ("tiff", ((0, b"II+\x00"),)),
+    ("tiff", ((0, b"MM\x00+"),)),
+    ("cr2", ((0, b"II*\x00"), (8, b"CR\x02"))),
+    ("cr3", ((4, b"ftypcrx "),)),
+    ("orf", ((0, b"IIRO"),)),
+    ("orf", ((0, b"IIRS"),)),
+    ("rw2", ((0, b"IIU\x00"),)),
+    ("raf", ((0, b"FUJIFILMCCD-RAW"),)),
+    ("webp", ((0, b"RIFF"), (8, b"WEBP"))),
+    ("heic", ((4, b"ftypheic"),)),
+    ("heic", ((4, b"ftypheix"),)),
+    ("heic", ((4, b"ftyphevc"),)),
+    ("heic", ((4, b"ftypheim"),)),
+    ("heic", ((4, b"ftypheis"),)),
+    ("heic", ((4, b"ftypmif1"),)),
+    ("heic", ((4, b"ftypmsf1"),)),
+    ("avif", ((4, b"ftypavif"),)),
+    ("avif", ((4, b"ftypavis"),)),
+    ("ico", ((0, b"\x00\x00\x01\x00"),)),
+    ("cur", ((0, b"\x00\x00\x02\x00"),)),
+    ("ani", ((0, b"RIFF"), (8, b"ACON"))),
+    ("psd", ((0, b"8BPS"),)),
+    ("jp2", ((0, b"\x00\x00\x00\x0cjP  \r\n\x87\n"),)),
+    ("jp2", ((0, b"\xff\x4f\xff\x51"),)),
+    ("jxl", ((0, b"\xff\x0a"),)),
+    ("jxl", ((0, b"\x00\x00\x00\x0cJXL \r\n\x87\n"),)),
+    ("xcf", ((0, b"gimp xcf"),)),
+    ("exr", ((0, b"v/1\x01"),)),
+    ("bpg", ((0, b"BPG\xfb"),)),
+    ("flif", ((0, b"FLIF"),)),
+    ("qoi", ((0, b"qoif"),)),
+    ("dds", ((0, b"DDS "),)),
+    ("ktx", ((0, b"\xabKTX 11\xbb\r\n\x1a\n"),)),
+    ("ktx", ((0, b"\xabKTX 20\xbb\r\n\x1a\n"),)),
+    ("djvu", ((0, b"AT&TFORM"),)),
+    ("wmf", ((0, b"\xd7\xcd\xc6\x9a"),)),
+    ("wmf", ((0, b"\x01\x00\x09\x00\x00\x03"),)),
+    ("emf", ((0, b"\x01\x00\x00\x00"), (40, b" EMF"))),
+    ("fits", ((0, b"SIMPLE  ="),)),
+    ("dicom", ((128, b"DICM"),)),
+    ("dpx", ((0, b"SDPX"),)),
+    ("dpx", ((0, b"XPDS"),)),
+    ("iff", ((0, b"FORM"), (8, b"ILBM"))),
+    ("iff", ((0, b"FORM"), (8, b"PBM "))),
+    ("cdr", ((0, b"RIFF"), (8, b"CDR"))),
+    ("mp3", ((0, b"ID3"),)),
+    ("mp3", ((0, b"\xff\xfb"),)),
+    ("mp3", ((0, b"\xff\xfa"),)),
+    ("mp3", ((0, b"\xff\xf3"),)),
+    ("mp3", ((0, b"\xff\xf2"),)),
+    ("mp3", ((0, b"\xff\xe3"),)),
+    ("aac", ((0, b"\xff\xf1"),)),
+    ("aac", ((0, b"\xff\xf9"),)),
+    ("flac", ((0, b"fLaC"),)),
+    ("ogg", ((0, b"OggS"),)),
+    ("wav", ((0, b"RIFF"), (8, b"WAVE"))),
+    ("wav", ((0, b"RF64"), (8, b"WAVE"))),
+    ("aiff", ((0, b"FORM"), (8, b"AIFF"))),
+    ("aiff", ((0, b"FORM"), (8, b"AIFC"))),
+    ("midi", ((0, b"MThd"),)),
+    ("rmi", ((0, b"RIFF"), (8, b"RMID"))),
+    ("amr", ((0, b"#!AMR"),)),
+    ("ape", ((0, b"MAC "),)),
+    ("wv", ((0, b"wvpk"),)),
+    ("au", ((0, b".snd"),)),
+    ("m4a", ((4, b"ftypM4A "),)),
+    ("m4a", ((4, b"ftypM4B "),)),
+    ("m4a", ((4, b"ftypM4P "),)),
+    ("mp4", ((4, b"ftypisom"),)),
+    ("mp4", ((4, b"ftypiso2"),)),
+    ("mp4", ((4, b"ftypiso4"),)),
+    ("mp4", ((4, b"ftypiso5"),)),
+    ("mp4", ((4, b"ftypiso6"),)),
+    ("mp4", ((4, b"ftypmp41"),)),
+    ("mp4", ((4, b"ftypmp42"),)),
+    ("mp4", ((4, b"ftypavc1"),)),
+    ("mp4", ((4, b"ftypdash"),)),
+    ("mp4", ((4, b"ftypMSNV"),)),
+    ("mp4", ((4, b"ftypM4V "),)),
+    ("mp4", ((4, b"ftypM4VH"),)),
+    ("mp4", ((4, b"ftypf4v "),)),
+    ("mp4", ((4, b"ftypmmp4"),)),
+    ("3gp", ((4, b"ftyp3gp"),)),
+    ("3gp", ((4, b"ftyp3g2"),)),
+    ("mov", ((4, b"ftypqt  "),)),
+    ("mov", ((4, b"moov"),)),
+    ("mov", ((4, b"mdat"),)),
+    ("mov", ((4, b"wide"),)),
+    ("mkv", ((0, b"\x1a\x45\xdf\xa3"),)),
+    ("avi", ((0, b"RIFF"), (8, b"AVI "))),
+    ("flv", ((0, b"FLV\x01"),)),
+    ("asf", ((0, b"\x30\x26\xb2\x75\x8e\x66\xcf\x11\xa6\xd9\x00\xaa\x00\x62\xce\x6c"),)),
+    ("mpeg", ((0, b"\x00\x00\x01\xba"),)),
+    ("mpeg", ((0, b"\x00\x00\x01\xb3"),)),
+    ("rm", ((0, b".RMF"),)),
+    ("swf", ((0, b"FWS"),)),
+    ("swf", ((0, b"CWS"),)),
+    ("swf", ((0, b"ZWS"),)),
+    ("pdf", ((0, b"%PDF-"),)),
+    ("ps", ((0, b"%!PS"),)),
+    ("epsbin", ((0, b"\xc5\xd0\xd3\xc6"),)),
+    ("rtf", ((0, b"{\\rtf"),)),
+    ("ole", ((0, b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"),)),
+    ("zip", ((0, b"PK\x03\x04"),)),
+    ("zip", ((0, b"PK\x05\x06"),)),
+    ("zip", ((0, b"PK\x07\x08"),)),
+    ("mobi", ((60, b"BOOKMOBI"),)),
+    ("mobi", ((60, b"TEXtREAd"),)),
+    ("lit", ((0, b"ITOLITLS"),)),
+    ("chm", ((0, b"ITSF\x03\x00\x00\x00"),)),
+    ("wpd", ((0, b"\xffWPC"),)),
+    ("indd", ((0, b"\x06\x06\xed\xf5\xd8\x1d\x46\xe5\xbd\x31\xef\xe7\xfe\x74\xb7\x1d"),)),
+    ("onenote", ((0, b"\xe4\x52\x5c\x7b\x8c\xd8\xa7\x4d\xae\xb1\x53\x78\xd0\x29\x96\xd3"),)),
+    ("xml", ((0, b"<?xml"),)),
+    ("xml", ((0, b"\xef\xbb\xbf<?xml"),)),
+    ("xml", ((0, b"<svg"),)),
+    ("html", ((0, b"<!DOCTYPE html"),)),
+    ("html", ((0, b"<!DOCTYPE HTML"),)),
+    ("html", ((0, b"<!doctype html"),)),
+    ("html", ((0, b"<html"),)),
+    ("html", ((0, b"<HTML"),)),
+    ("script", ((0, b"#!"),)),
+    ("pem", ((0, b"-----BEGIN "),)),
+    ("pgp", ((0, b"-----BEGIN PGP"),)),
+    ("vcard", ((0, b"BEGIN:VCARD"),)),
+    ("ical", ((0, b"BEGIN:VCALENDAR"),)),
+    ("warc", ((0, b"WARC/"),)),
+    ("vault", ((0, b"$ANSIBLE_VAULT"),)),
+    ("gzip", ((0, b"\x1f\x8b\x08"),)),
+    ("bzip2", ((0, b"BZh"),)),
+    ("xz", ((0, b"\xfd7zXZ\x00"),)),
+    ("7z", ((0, b"7z\xbc\xaf\x27\x1c"),)),
+    ("rar", ((0, b"Rar!\x1a\x07\x00"),)),
+    ("rar", ((0, b"Rar!\x1a\x07\x01\x00"),)),
+    ("tar", ((257, b"ustar\x00"),)),
+    ("tar", ((257, b"ustar  \x00"),)),
+    ("zstd", ((0, b"\x28\xb5\x2f\xfd"),)),
+    ("lz4", ((0, b"\x04\x22\x4d\x18"),)),
+    ("lzip", ((0, b"LZIP"),)),
+    ("compress", ((0, b"\x1f\x9d"),)),
+    ("compress", ((0, b"\x1f\xa0"),)),
+    ("cab", ((0, b"MSCF\x00\x00\x00\x00"),)),
+    ("iscab", ((0, b"ISc("),)),
+    ("arj", ((0, b"\x60\xea"),)),
+    ("lzh", ((2, b"-lh"),)),
+    ("lzh", ((2, b"-lz"),)),
+    ("zoo", ((20, b"\xdc\xa7\xc4\xfd"),)),
+    ("cpio", ((0, b"070707"),)),
+    ("cpio", ((0, b"070701"),)),
+    ("cpio", ((0, b"070702"),)),
+    ("cpio", ((0, b"\xc7\x71"),)),
+    ("deb", ((0, b"!<arch>\ndebian"),)),
+    ("ar", ((0, b"!<arch>\n"),)),
+    ("rpm", ((0, b"\xed\xab\xee\xdb"),)),
+    ("xar", ((0, b"xar!"),)),
+    ("crx", ((0, b"Cr24"),)),
+    ("wim", ((0, b"MSWIM\x00\x00\x00"),)),
+    ("squashfs", ((0, b"hsqs"),)),
+    ("squashfs", ((0, b"sqsh"),)),
+    ("vmdk", ((0, b"KDMV"),)),
+    ("vmdk", ((0, b"# Disk DescriptorFile"),)),
+    ("vhd", ((0, b"conectix"),)),
+    ("vhdx", ((0, b"vhdxfile"),)),
+    ("qcow", ((0, b"QFI\xfb"),)),
+    ("vdi", ((64, b"\x7f\x10\xda\xbe"),)),
+    ("luks", ((0, b"LUKS\xba\xbe"),)),
+    ("bitlocker", ((3, b"-FVE-FS-"),)),
+    ("pe", ((0, b"MZ"),)),
+    ("elf", ((0, b"\x7fELF"),)),
+    ("macho", ((0, b"\xfe\xed\xfa\xce"),)),
+    ("macho", ((0, b"\xfe\xed\xfa\xcf"),)),
+    ("macho", ((0, b"\xce\xfa\xed\xfe"),)),
+    ("macho", ((0, b"\xcf\xfa\xed\xfe"),)),
+    ("fat", ((0, b"\xca\xfe\xba\xbe"),)),
+    ("dex", ((0, b"dex\n"),)),
+    ("wasm", ((0, b"\x00asm"),)),
+    ("luac", ((0, b"\x1bLua"),)),
+    ("lnk", ((0, b"L\x00\x00\x00\x01\x14\x02\x00"),)),
+    ("jser", ((0, b"\xac\xed\x00\x05"),)),
+    ("sqlite", ((0, b"SQLite format 3\x00"),)),
+    ("mdb", ((4, b"Standard Jet DB"),)),
+    ("accdb", ((4, b"Standard ACE DB"),)),
+    ("ese", ((4, b"\xef\xcd\xab\x89"),)),
+    ("pst", ((0, b"!BDN"),)),
+    ("kdbx", ((0, b"\x03\xd9\xa2\x9a\x67\xfb\x4b\xb5"),)),
+    ("kdbx", ((0, b"\x03\xd9\xa2\x9a\x65\xfb\x4b\xb5"),)),
+    ("regf", ((0, b"regf"),)),
+    ("evtx", ((0, b"ElfFile\x00"),)),
+    ("evt", ((4, b"LfLe"),)),
+    ("prefetch", ((4, b"SCCA"),)),
+    ("prefetch", ((0, b"MAM\x04"),)),
+    ("minidump", ((0, b"MDMP"),)),
+    ("pcap", ((0, b"\xd4\xc3\xb2\xa1"),)),
+    ("pcap", ((0, b"\xa1\xb2\xc3\xd4"),)),
+    ("pcap", ((0, b"\x4d\x3c\xb2\xa1"),)),
+    ("pcap", ((0, b"\xa1\xb2\x3c\x4d"),)),
+    ("pcapng", ((0, b"\x0a\x0d\x0d\x0a"),)),
+    ("bplist", ((0, b"bplist0"),)),
+    ("parquet", ((0, b"PAR1"),)),
+    ("avro", ((0, b"Obj\x01"),)),
+    ("orc", ((0, b"ORC"),)),
+    ("hdf5", ((0, b"\x89HDF\r\n\x1a\n"),)),
+    ("netcdf", ((0, b"CDF\x01"),)),
+    ("netcdf", ((0, b"CDF\x02"),)),
+    ("arrow", ((0, b"ARROW1"),)),
+    ("npy", ((0, b"\x93NUMPY"),)),
+    ("pickle", ((0, b"\x80\x04\x95"),)),
+    ("pickle", ((0, b"\x80\x05\x95"),)),
+    ("mat", ((0, b"MATLAB 5.0 MAT-file"),)),
+    ("gitpack", ((0, b"PACK\x00\x00\x00"),)),
+    ("torrent", ((0, b"d8:announce"),)),
+    ("torrent", ((0, b"d13:announce-list"),)),
+    ("jks", ((0, b"\xfe\xed\xfe\xed"),)),
+    ("openssl", ((0, b"Salted__"),)),
+    ("age", ((0, b"age-encryption.org/v1"),)),
+    ("ttf", ((0, b"\x00\x01\x00\x00\x00"),)),
+    ("ttf", ((0, b"true"),)),
+    ("otf", ((0, b"OTTO"),)),
+    ("ttc", ((0, b"ttcf"),)),
+    ("woff", ((0, b"wOFF"),)),
+    ("woff2", ((0, b"wOF2"),)),
+    ("blend", ((0, b"BLENDER"),)),
+    ("fbx", ((0, b"Kaydara FBX Binary"),)),
+    ("glb", ((0, b"glTF"),)),
+    ("dwg", ((0, b"AC10"),)),
+]
+
+SEARCH = [(b"%PDF-", "pdf")]
+
+ZIP_MIMETYPES = {
+    b"application/vnd.oasis.opendocument.text": "odt",
+    b"application/vnd.oasis.opendocument.spreadsheet": "ods",
+    b"application/vnd.oasis.opendocument.presentation": "odp",
+    b"application/vnd.oasis.opendocument.graphics": "odg",
+    b"application/epub+zip": "epub",
+}
+OOXML_PARTS = [("word/", "docx"), ("xl/", "xlsx"), ("ppt/", "pptx"), ("visio/", "vsdx"), ("FixedDocSeq.fdseq", "xps")]
+ZIP_MEMBERS = [("AndroidManifest.xml", ".dex", "apk"), ("META-INF/MANIFEST.MF", ".class", "jar")]
+ZIP_KINDS = frozenset(["zip", "ooxml"] + list(ZIP_MIMETYPES.values()) + [x[-1] for x in OOXML_PARTS + ZIP_MEMBERS])
+
+
+class MagicIndex:
+    def __init__(self, signatures=SIGNATURES, types=TYPES):
+        self.types = {k: FileType(k, *v[:2], frozenset(v[2].split()), v[3]) for k, v in types.items()}
+        self.buckets = {}
+        for name, conds in signatures:
+            off, magic = conds[0]
+            bucket = self.buckets.setdefault(off, {}).setdefault(magic[:KEY_LEN], [])
+            bucket.append((sum(len(m) for _, m in conds), conds, self.types[name]))
+        for by_key in self.buckets.values():
+            for bucket in by_key.values(): bucket.sort(key=lambda x: -x[0])
+        self.offsets = sorted(self.buckets)
+        self.strict = frozenset(e for t in self.types.values() if t.kind != "text" for e in t.exts)
+
+    def identify(self, head):
+        best = None
+        for off in self.offsets:
+            bucket = self.buckets[off].get(head[off:off + KEY_LEN])
+            if not bucket: continue
+            for weight, conds, ftype in bucket:
+                if best and weight <= best[0]: break
+                if all(head.startswith(m, o) for o, m in conds):
+                    best = (weight, ftype)
+                    break
+        if best is None:
+            for needle, name in SEARCH:
+                if needle in head: return self.types[name]
+            return None
+        ftype = best[1]
+        if ftype.name == "zip": ftype = self.zip_kind(head) or ftype
+        return ftype
+
+    def zip_kind(self, head):
+        names, mimetype, pos = [], b"", 0
+        while head.startswith(b"PK\x03\x04", pos) and pos + 30 <= len(head):
+            flags, method, csize, nlen, xlen = struct.unpack_from("<HH8xI4xHH", head, pos + 6)
+            data = pos + 30 + nlen + xlen
+            if data > len(head): break
+            name = head[pos + 30:pos + 30 + nlen].decode("utf-8", errors="replace")
+            names.append(name)
+            if name == "mimetype" and method == 0: mimetype = head[data:data + csize]
+            if flags & 8: break
+            pos = data + csize
+        return self.zip_names_kind(names, mimetype)
+
+    def zip_names_kind(self, names, mimetype=b""):
+        if mimetype.strip() in ZIP_MIMETYPES: return self.types[ZIP_MIMETYPES[mimetype.strip()]]
+        if "[Content_Types].xml" in names:
+            for prefix, name in OOXML_PARTS:
+                if any(n.startswith(prefix) for n in names): return self.types[name]
+            return self.types["ooxml"]
+        for member, suffix, name in ZIP_MEMBERS:
+            if member in names and any(n.endswith(suffix) for n in names): return self.types[name]
+        return None
+
+    def zip_refine(self, ftype, f):
+        if ftype is None or ftype.name not in ZIP_KINDS: return ftype
+        pos = f.tell()
+        try:
+            f.seek(0)
+            with zipfile.ZipFile(f) as z:
+                names = z.namelist()
+                mimetype = b""
+                if "mimetype" in names:
+                    with z.open("mimetype") as m: mimetype = m.read(MIMETYPE_MAX)
+            return self.zip_names_kind(names, mimetype) or self.types["zip"]
+        except (zipfile.BadZipFile, OSError, ValueError, EOFError, NotImplementedError): return ftype
+        finally: f.seek(pos)
+
+    def matches(self, ftype, ext):
+        ext = ext.lstrip(".").lower()
+        if ext not in self.strict: return True
+        return ftype is not None and ext in ftype.exts
+
+
+_index = None
+
+def index():
+    global _index
+    if _index is None: _index = MagicIndex()
+    return _index
+
+def identify(head, f=None):
+    ft = index().identify(bytes(head[:HEAD_BYTES]))
+    return ft if f is None else index().zip_refine(ft, f)
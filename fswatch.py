@@ -0,0 +1,85 @@
+import os
+import sys
+import errno
+import ctypes
+import ctypes.util
+import select
+import struct
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+EVENT = struct.Struct("iIII")
+READ_BUF = 256 * 1024
+
+_libc = None
+
+def libc():
+    global _libc
+    if _libc is None:
+        if not sys.platform.startswith("linux"): raise OSError(errno.ENOSYS, "inotify solo esta disponible en Linux")
+        lib = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        lib.inotify_init1.argtypes = [ctypes.c_int]
+        lib.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        lib.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        _libc = lib
+    return _libc
+
+def _check(ret, path=None):
+    if ret < 0:
+        e = ctypes.get_errno()
+        raise OSError(e, os.strerror(e), path)
+    return ret
+
+
+class Inotify:
+    def __init__(self):
+        self.lib = libc()
+        self.fd = _check(self.lib.inotify_init1(IN_NONBLOCK | IN_CLOEXEC))
+        self.poller = select.poll()
+        self.poller.register(self.fd, select.POLLIN)
+
+    def add_watch(self, path, mask=WATCH_MASK):
+        return _check(self.lib.inotify_add_watch(self.fd, os.fsencode(path), mask | IN_ONLYDIR | IN_DONT_FOLLOW), path)
+
+    def rm_watch(self, wd):
+        self.lib.inotify_rm_watch(self.fd, wd)
+
+    def read(self, timeout=None):
+        if not self.poller.poll(None if timeout is None else int(timeout * 1000)): return []
+        try: data = os.read(self.fd, READ_BUF)
+        except BlockingIOError: return []
+        events, pos = [], 0
+        while pos < len(data):
+            wd, mask, cookie, n = EVENT.unpack_from(data, pos)
+            pos += EVENT.size
+            name = os.fsdecode(data[pos:pos + n].rstrip(b"\0"))
+            pos += n
+            events.append((wd, mask, cookie, name))
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
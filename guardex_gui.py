@@ -1,37 +1,379 @@
 import customtkinter as ctk
 import hashlib
 import os
+import json
 import threading
 import datetime
+import argparse
+import time
+import sys
+import stat
+import errno
+import queue
+import re
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from tkinter import filedialog
 from PIL import Image
+from vtable import VirtualTable
+import logsearch
+from logindex import LogIndex, tokens
+from fswatch import Inotify, IN_Q_OVERFLOW, IN_IGNORED, IN_ISDIR, IN_CREATE, IN_MOVED_TO, IN_DELETE, IN_MOVED_FROM, IN_DELETE_SELF, IN_MOVE_SELF
 
 COLOR_FONDO = "#171718"
 COLOR_HEADER_BG = "#121213"
 COLOR_ACENTO = "#2596be"
 COLOR_TARJETA = "#1F1F21"
 
+HASH_BUF = 4 * 1024 * 1024
+DIGESTS = ("sha256", "sha1", "md5", "blake2b")
+MANIFEST_DIR = os.path.join(".kinix", "guardex")
+MANIFEST_MAGIC = "# guardex-manifest v1"
+PROGRESS_EVERY = 0.25
+REPORT_DIR = os.path.join("logs", "guardex")
+STAT_KEYS = ("size", "mtime", "ctime", "ino")
+WATCH_SETTLE = 0.5
+WATCH_LATENCY = 5.0
+WATCH_IDLE = 0.5
+WATCH_POLL = 250
+SEARCH_ROWS = 100000
+
+def fmt_bytes(n):
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if n < 1024 or unit == "TB": break
+        n /= 1024
+    return f"{n:.1f} {unit}"
+
 class GuardexLogic:
+    def __init__(self):
+        self.local = threading.local()
+
     def calc_hash(self, path):
         if not os.path.exists(path): return None
-        h = hashlib.sha256()
-        with open(path, "rb") as f:
-            for b in iter(lambda: f.read(4096), b""): h.update(b)
-        return h.hexdigest()
-
-    def search_recursive(self, folder, key):
-        matches = []
-        for root, _, files in os.walk(folder):
-            for file in files:
-                if file.endswith((".log", ".txt", ".xml", ".json")):
-                    path = os.path.join(root, file)
+        return self.hash_file(path, ("sha256",))["sha256"]
+
+    def hash_file(self, path, algos=DIGESTS):
+        buf = getattr(self.local, "buf", None)
+        if buf is None: buf = self.local.buf = bytearray(HASH_BUF)
+        mv = memoryview(buf)
+        hs = [hashlib.new(a) for a in algos]
+        with open(path, "rb", buffering=0) as f:
+            while True:
+                n = f.readinto(buf)
+                if not n: break
+                for h in hs: h.update(mv[:n])
+        return {a: h.hexdigest() for a, h in zip(algos, hs)}
+
+    def walk_files(self, folder):
+        stack = [folder]
+        while stack:
+            d = stack.pop()
+            try: it = os.scandir(d)
+            except OSError: continue
+            with it:
+                for e in it:
                     try:
-                        with open(path, "r", encoding='utf-8', errors='ignore') as f:
-                            for i, line in enumerate(f):
-                                if key in line:
-                                    matches.append(f"[{file}:{i+1}] {line.strip()[:100]}")
-                    except: pass
-        return matches
+                        if e.is_dir(follow_symlinks=False): stack.append(e.path)
+                        elif e.is_file(follow_symlinks=False): yield e.path, e.stat(follow_symlinks=False)
+                    except OSError: pass
+
+    def manifest_entry(self, folder, path, st, algos):
+        return {"path": os.path.relpath(path, folder), "size": st.st_size, "mtime": st.st_mtime_ns, "ctime": st.st_ctime_ns,
+                "ino": st.st_ino, "digests": self.hash_file(path, algos)}
+
+    def manifest_path(self, folder):
+        folder = os.path.abspath(folder)
+        tag = hashlib.sha1(folder.encode()).hexdigest()[:8]
+        return os.path.join(MANIFEST_DIR, f"manifest_{os.path.basename(folder) or 'root'}_{tag}.tsv")
+
+    def hash_tree(self, folder, files, algos=DIGESTS, workers=None, progress=None, errors=None):
+        workers = workers or min(32, (os.cpu_count() or 1) * 2)
+        done = total = 0
+        last = 0.0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = {}
+            while True:
+                for path, st in files:
+                    pending[pool.submit(self.manifest_entry, folder, path, st, algos)] = path
+                    if len(pending) >= workers * 4: break
+                if not pending: break
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    path = pending.pop(fut)
+                    try: e = fut.result()
+                    except OSError as ex:
+                        if errors is not None: errors.append(f"{path}: {ex}")
+                        continue
+                    done += 1
+                    total += e["size"]
+                    yield e
+                if progress and time.time() - last > PROGRESS_EVERY:
+                    last = time.time()
+                    progress(done, total)
+        if progress: progress(done, total)
+
+    def build_manifest(self, folder, out=None, algos=DIGESTS, workers=None, progress=None):
+        folder = os.path.abspath(folder)
+        out = out or self.manifest_path(folder)
+        os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+        t0 = time.time()
+        count = size = 0
+        errors = []
+        try:
+            with open(out + ".tmp", "w", encoding="utf-8", newline="\n") as f:
+                f.write(self.manifest_header(folder, algos))
+                for e in self.hash_tree(folder, self.walk_files(folder), algos, workers, progress, errors):
+                    f.write(self.manifest_line(e, algos))
+                    count += 1
+                    size += e["size"]
+            os.replace(out + ".tmp", out)
+        finally:
+            if os.path.exists(out + ".tmp"): os.remove(out + ".tmp")
+        return {"out": out, "files": count, "bytes": size, "seconds": time.time() - t0, "errors": errors}
+
+    def manifest_header(self, root, algos, created=None):
+        created = created or datetime.datetime.now().isoformat(timespec="seconds")
+        return f"{MANIFEST_MAGIC}\t{json.dumps(root)}\t{','.join(algos)}\t{created}\n"
+
+    def manifest_line(self, e, algos):
+        return "\t".join([str(e[k]) for k in STAT_KEYS] + [e["digests"][a] for a in algos] + [json.dumps(e["path"])]) + "\n"
+
+    def save_manifest(self, m, out):
+        try:
+            with open(out + ".tmp", "w", encoding="utf-8", newline="\n") as f:
+                f.write(self.manifest_header(m["root"], m["algos"], m["created"]))
+                for e in m["entries"].values(): f.write(self.manifest_line(e, m["algos"]))
+            os.replace(out + ".tmp", out)
+        finally:
+            if os.path.exists(out + ".tmp"): os.remove(out + ".tmp")
+
+    def load_manifest(self, path):
+        entries = {}
+        with open(path, "r", encoding="utf-8") as f:
+            head = f.readline().rstrip("\n").split("\t")
+            if head[0] != MANIFEST_MAGIC: raise ValueError(f"{path} no es un manifiesto de Guardex")
+            root, algos = json.loads(head[1]), head[2].split(",")
+            for line in f:
+                x = line.rstrip("\n").split("\t")
+                if len(x) != 5 + len(algos): continue
+                rel = json.loads(x[-1])
+                entries[rel] = {"path": rel, "size": int(x[0]), "mtime": int(x[1]), "ctime": int(x[2]), "ino": int(x[3]),
+                                "digests": dict(zip(algos, x[4:-1]))}
+        return {"root": root, "algos": algos, "created": head[3] if len(head) > 3 else "", "entries": entries}
+
+    def verify(self, folder, baseline=None, paranoid=False, refresh=True, workers=None, progress=None):
+        folder = os.path.abspath(folder)
+        baseline = baseline or self.manifest_path(folder)
+        m = self.load_manifest(baseline)
+        entries = m["entries"]
+        algo = "sha256" if "sha256" in m["algos"] else m["algos"][0]
+        t0 = time.time()
+        r = {"folder": folder, "baseline": baseline, "paranoid": paranoid, "added": [], "removed": [], "modified": [],
+             "touched": [], "unchanged": 0, "rehashed": 0, "errors": []}
+        seen = set()
+
+        def suspects():
+            for path, st in self.walk_files(folder):
+                rel = os.path.relpath(path, folder)
+                seen.add(rel)
+                old = entries.get(rel)
+                if old is None: r["added"].append(rel)
+                elif old["size"] != st.st_size: r["modified"].append({"path": rel, "reason": f"tamano {old['size']} -> {st.st_size}"})
+                elif paranoid or any(old[k] != v for k, v in zip(STAT_KEYS, (st.st_size, st.st_mtime_ns, st.st_ctime_ns, st.st_ino))): yield path, st
+                else: r["unchanged"] += 1
+
+        for e in self.hash_tree(folder, suspects(), (algo,), workers, progress, r["errors"]):
+            r["rehashed"] += 1
+            old = entries[e["path"]]
+            if e["digests"][algo] != old["digests"][algo]:
+                r["modified"].append({"path": e["path"], "reason": f"{algo} distinto"})
+            elif any(old[k] != e[k] for k in STAT_KEYS):
+                r["touched"].append(e["path"])
+                old.update({k: e[k] for k in STAT_KEYS})
+            else: r["unchanged"] += 1
+        r["removed"] = sorted(set(entries) - seen)
+        r["added"].sort()
+        r["modified"].sort(key=lambda x: x["path"])
+        if refresh and r["touched"]: self.save_manifest(m, baseline)
+        r["seconds"] = time.time() - t0
+        r["ok"] = not (r["added"] or r["removed"] or r["modified"])
+        return r
+
+    def save_report(self, r):
+        os.makedirs(REPORT_DIR, exist_ok=True)
+        n = f"verify_{os.path.basename(r['folder']) or 'root'}_{datetime.datetime.now().strftime('%d%m%Y_%H%M%S')}.json"
+        path = os.path.join(REPORT_DIR, n)
+        with open(path, "w", encoding="utf-8") as f: json.dump(r, f, indent=4)
+        return path
+
+    def search_recursive(self, folder, patterns, regex=False, ignore_case=False, context=0, workers=None, stats=None):
+        if isinstance(patterns, str): patterns = [patterns]
+        return logsearch.search(folder, patterns, regex, ignore_case, context, workers, stats=stats)
+
+    def index_search(self, folder, patterns, ignore_case=False, progress=None, stats=None, substring=False):
+        if isinstance(patterns, str): patterns = [patterns]
+        ix = LogIndex()
+        try:
+            r = ix.update(folder, progress=progress)
+            if stats is not None: stats.update({"files": r["files"], "bytes": r["bytes"], "indexed": r["indexed"], "hits": 0, "errors": []})
+            root = os.path.abspath(folder)
+            for h in ix.query(patterns, ignore_case, root, substring):
+                h["path"] = os.path.join(folder, os.path.relpath(h["path"], root))
+                if stats is not None: stats["hits"] += 1
+                yield h
+        finally: ix.close()
+
+class GuardexWatcher:
+    def __init__(self, logic, folders, log_path=None, settle=WATCH_SETTLE, latency=WATCH_LATENCY, workers=None):
+        self.logic = logic
+        self.roots = {}
+        for d in folders:
+            d = os.path.abspath(d)
+            path = logic.manifest_path(d)
+            m = logic.load_manifest(path)
+            self.roots[d] = {"baseline": path, "manifest": m, "algo": "sha256" if "sha256" in m["algos"] else m["algos"][0], "dirty": False}
+        self.log_path = log_path or os.path.join(REPORT_DIR, f"watch_{datetime.datetime.now().strftime('%d%m%Y_%H%M%S')}.jsonl")
+        self.settle = settle
+        self.latency = latency
+        self.workers = workers
+        self.state = {}
+        self.wds = {}
+        self.ino = None
+        self.stop_evt = threading.Event()
+
+    def stop(self):
+        self.stop_evt.set()
+
+    def event(self, kind, root="", path="", detail=""):
+        return {"time": datetime.datetime.now().isoformat(timespec="seconds"), "event": kind, "root": root, "path": path, "detail": detail}
+
+    def add_tree(self, root, d, pending, errs):
+        stack = [d]
+        while stack:
+            d = stack.pop()
+            try: self.wds[self.ino.add_watch(d)] = (root, d)
+            except OSError as e:
+                if e.errno == errno.ENOSPC: errs.append(self.event("ERROR", root, d, "limite de inotify alcanzado (fs.inotify.max_user_watches)"))
+                elif e.errno != errno.ENOENT: errs.append(self.event("ERROR", root, d, str(e)))
+                continue
+            try: it = os.scandir(d)
+            except OSError: continue
+            with it:
+                for e in it:
+                    try:
+                        if e.is_dir(follow_symlinks=False): stack.append(e.path)
+                        else: pending.add((root, e.path))
+                    except OSError: pass
+
+    def mark_prefix(self, root, d, pending):
+        prefix = os.path.relpath(d, root) + os.sep
+        pending.update((root, os.path.join(root, rel)) for rel in self.roots[root]["manifest"]["entries"] if rel.startswith(prefix))
+        pending.update(k for k in self.state if k[0] == root and k[1].startswith(d + os.sep))
+
+    def sweep(self, pending, errs):
+        for root, r in self.roots.items():
+            self.add_tree(root, root, pending, errs)
+            pending.update((root, os.path.join(root, rel)) for rel in r["manifest"]["entries"])
+
+    def collect(self, events, pending, errs):
+        overflow = False
+        for wd, mask, cookie, name in events:
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+                continue
+            loc = self.wds.get(wd)
+            if loc is None: continue
+            root, d = loc
+            if mask & IN_IGNORED:
+                del self.wds[wd]
+                continue
+            if not name:
+                if d == root and mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    errs.append(self.event("ERROR", root, "", "la carpeta vigilada fue movida o eliminada"))
+                    self.mark_prefix(root, root, pending)
+                continue
+            path = os.path.join(d, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO): self.add_tree(root, path, pending, errs)
+                if mask & (IN_DELETE | IN_MOVED_FROM): self.mark_prefix(root, path, pending)
+            else: pending.add((root, path))
+        return overflow
+
+    def check(self, pending, errs):
+        status, todo = {}, {}
+        for root, path in pending:
+            r = self.roots[root]
+            rel = os.path.relpath(path, root)
+            old = r["manifest"]["entries"].get(rel)
+            try: st = os.lstat(path)
+            except FileNotFoundError: st = None
+            except OSError as e:
+                errs.append(self.event("ERROR", root, rel, str(e)))
+                continue
+            if st is not None and not stat.S_ISREG(st.st_mode): st = None
+            if st is None: status[(root, path)] = ("ELIMINADO", "") if old else None
+            elif old is None: status[(root, path)] = ("NUEVO", fmt_bytes(st.st_size))
+            elif old["size"] != st.st_size: status[(root, path)] = ("MODIFICADO", f"tamano {old['size']} -> {st.st_size}")
+            elif all(old[k] == v for k, v in zip(STAT_KEYS, (st.st_size, st.st_mtime_ns, st.st_ctime_ns, st.st_ino))): status[(root, path)] = None
+            else: todo.setdefault(root, []).append((path, st))
+        for root, files in todo.items():
+            r = self.roots[root]
+            algo = r["algo"]
+            hash_errs = []
+            for e in self.logic.hash_tree(root, iter(files), (algo,), self.workers, errors=hash_errs):
+                old = r["manifest"]["entries"][e["path"]]
+                key = (root, os.path.join(root, e["path"]))
+                if e["digests"][algo] != old["digests"][algo]: status[key] = ("MODIFICADO", f"{algo} distinto")
+                else:
+                    old.update({k: e[k] for k in STAT_KEYS})
+                    r["dirty"] = True
+                    status[key] = None
+            errs.extend(self.event("ERROR", root, "", x) for x in hash_errs)
+        for (root, path), s in sorted(status.items(), key=lambda x: x[0]):
+            prev = self.state.get((root, path))
+            if s == prev: continue
+            if s is None:
+                del self.state[(root, path)]
+                rel = os.path.relpath(path, root)
+                yield self.event("RESTAURADO", root, rel, "coincide con la baseline" if rel in self.roots[root]["manifest"]["entries"] else "ya no existe")
+            else:
+                self.state[(root, path)] = s
+                yield self.event(s[0], root, os.path.relpath(path, root), s[1])
+
+    def watch(self, initial=True):
+        os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+        with Inotify() as ino, open(self.log_path, "a", encoding="utf-8") as log:
+            self.ino = ino
+            def emit(ev):
+                log.write(json.dumps(ev) + "\n")
+                log.flush()
+                return ev
+            try:
+                pending, errs = set(), []
+                self.sweep(pending, errs)
+                if not initial: pending.clear()
+                yield emit(self.event("INICIO", "", "", f"{len(self.roots)} carpetas, {len(self.wds)} directorios vigilados"))
+                while True:
+                    for ev in errs: yield emit(ev)
+                    errs = []
+                    for ev in self.check(pending, errs): yield emit(ev)
+                    for ev in errs: yield emit(ev)
+                    pending, errs = set(), []
+                    events, overflow = [], False
+                    while not events:
+                        if self.stop_evt.is_set(): return
+                        events = ino.read(WATCH_IDLE)
+                    t0 = time.time()
+                    while events:
+                        overflow |= self.collect(events, pending, errs)
+                        if time.time() - t0 >= self.latency: break
+                        events = ino.read(self.settle)
+                    if overflow:
+                        errs.append(self.event("DESBORDE", "", "", "cola de inotify desbordada, reescaneando"))
+                        self.sweep(pending, errs)
+            finally:
+                for r in self.roots.values():
+                    if r["dirty"]: self.logic.save_manifest(r["manifest"], r["baseline"])
+                self.ino = None
 
 class GuardexWindow(ctk.CTkToplevel):
     def __init__(self, parent):
@@ -64,6 +406,7 @@ class GuardexWindow(ctk.CTkToplevel):
         self.tabs.grid(row=1, column=0, sticky="nsew", padx=20)
         self.tab_h = self.tabs.add("Integridad de Archivos")
         self.tab_l = self.tabs.add("Búsqueda en Logs")
+        self.tab_w = self.tabs.add("Vigilancia")
 
         self.btn_f = ctk.CTkButton(self.tab_h, text="SELECCIONAR ARCHIVO", fg_color=COLOR_ACENTO, command=self.do_hash)
         self.btn_f.pack(pady=20)
@@ -76,14 +419,77 @@ class GuardexWindow(ctk.CTkToplevel):
         self.lbl_res = ctk.CTkLabel(self.tab_h, text="")
         self.lbl_res.pack()
 
+        mf = ctk.CTkFrame(self.tab_h, fg_color=COLOR_TARJETA)
+        mf.pack(fill="x", padx=20, pady=(30, 10))
+        ctk.CTkLabel(mf, text="MANIFIESTO DE CARPETA (SHA-256 / SHA-1 / MD5 / BLAKE2)", font=("Roboto", 12, "bold"), text_color="gray").pack(anchor="w", padx=15, pady=(10, 5))
+        self.btn_m = ctk.CTkButton(mf, text="GENERAR MANIFIESTO", fg_color=COLOR_ACENTO, command=self.do_manifest)
+        self.btn_m.pack(anchor="w", padx=15, pady=5)
+        self.lbl_m = ctk.CTkLabel(mf, text="", text_color="gray", justify="left", anchor="w")
+        self.lbl_m.pack(fill="x", padx=15, pady=(0, 5))
+        vf = ctk.CTkFrame(mf, fg_color="transparent")
+        vf.pack(fill="x", padx=15, pady=(0, 10))
+        self.btn_v = ctk.CTkButton(vf, text="VERIFICAR CONTRA BASELINE", fg_color="#333", command=self.do_verify)
+        self.btn_v.pack(side="left")
+        self.chk_par = ctk.CTkCheckBox(vf, text="Modo paranoico (rehash completo)")
+        self.chk_par.pack(side="left", padx=15)
+        self.tbl_v = VirtualTable(mf, [
+            {"title": "ESTADO", "width": 110, "color": "#FF5555"},
+            {"title": "ARCHIVO", "max": 70},
+            {"title": "DETALLE", "width": 200, "color": "gray"},
+        ], rows=10, fg_color="transparent")
+
         fr = ctk.CTkFrame(self.tab_l, fg_color="transparent")
         fr.pack(fill="x")
-        self.e_k = ctk.CTkEntry(fr, placeholder_text="Palabra clave (Error, Fail, Admin)", width=200)
+        self.e_k = ctk.CTkEntry(fr, placeholder_text="Palabras clave separadas por coma (Error, Fail, Admin)", width=300)
         self.e_k.pack(side="left", padx=5)
         self.btn_l = ctk.CTkButton(fr, text="BUSCAR EN CARPETA", fg_color=COLOR_ACENTO, command=self.do_log)
         self.btn_l.pack(side="left", padx=5)
-        self.scr_l = ctk.CTkScrollableFrame(self.tab_l)
-        self.scr_l.pack(fill="both", expand=True, pady=10)
+        of = ctk.CTkFrame(self.tab_l, fg_color="transparent")
+        of.pack(fill="x", pady=(5, 0))
+        self.chk_re = ctk.CTkCheckBox(of, text="Expresión regular")
+        self.chk_re.pack(side="left", padx=5)
+        self.chk_ic = ctk.CTkCheckBox(of, text="Ignorar mayúsculas")
+        self.chk_ic.pack(side="left", padx=5)
+        self.chk_ic.select()
+        ctk.CTkLabel(of, text="Contexto:", text_color="gray").pack(side="left", padx=(10, 5))
+        self.opt_ctx = ctk.CTkOptionMenu(of, values=["0", "1", "2", "3", "5"], width=60)
+        self.opt_ctx.pack(side="left")
+        self.opt_ctx.set("2")
+        self.chk_ix = ctk.CTkCheckBox(of, text="Usar índice persistente")
+        self.chk_ix.pack(side="left", padx=15)
+        self.chk_sub = ctk.CTkCheckBox(of, text="Subcadenas en el índice (lento)")
+        self.chk_sub.pack(side="left", padx=5)
+        self.lbl_l = ctk.CTkLabel(self.tab_l, text="", text_color="gray", anchor="w")
+        self.lbl_l.pack(fill="x", padx=5, pady=(5, 0))
+        self.search_stop = None
+        self.l_queue = queue.Queue()
+        self.l_hits = []
+        self.tbl_l = VirtualTable(self.tab_l, [
+            {"title": "ARCHIVO", "width": 180, "max": 28, "color": "gray"},
+            {"title": "LÍNEA", "width": 70, "color": COLOR_ACENTO},
+            {"title": "PATRÓN", "width": 110, "max": 16, "color": "#FF5555"},
+            {"title": "TEXTO", "max": 90},
+        ], rows=14, on_select=self.show_context, fg_color="transparent")
+        self.tbl_l.pack(fill="both", expand=True, pady=5)
+        self.txt_ctx = ctk.CTkTextbox(self.tab_l, height=110, font=("Consolas", 11))
+        self.txt_ctx.pack(fill="x", pady=(0, 5))
+
+        self.watcher = None
+        self.w_queue = queue.Queue()
+        self.w_rows = []
+        wf = ctk.CTkFrame(self.tab_w, fg_color="transparent")
+        wf.pack(fill="x", pady=(10, 5))
+        self.btn_w = ctk.CTkButton(wf, text="VIGILAR CARPETA", fg_color=COLOR_ACENTO, command=self.do_watch)
+        self.btn_w.pack(side="left", padx=5)
+        self.lbl_w = ctk.CTkLabel(wf, text="Requiere un manifiesto previo de la carpeta.", text_color="gray", anchor="w")
+        self.lbl_w.pack(side="left", fill="x", expand=True, padx=10)
+        self.tbl_w = VirtualTable(self.tab_w, [
+            {"title": "HORA", "width": 140, "color": "gray"},
+            {"title": "EVENTO", "width": 110, "color": "#FF5555"},
+            {"title": "ARCHIVO", "max": 60},
+            {"title": "DETALLE", "width": 200, "color": "gray"},
+        ], fg_color="transparent")
+        self.tbl_w.pack(fill="both", expand=True, pady=5)
 
     def do_hash(self):
         p = filedialog.askopenfilename()
@@ -101,22 +507,231 @@ class GuardexWindow(ctk.CTkToplevel):
         else:
             self.lbl_res.configure(text="❌ HASH NO COINCIDE", text_color="#FF5555")
 
+    def do_manifest(self):
+        d = filedialog.askdirectory()
+        self.lift()
+        if d:
+            self.btn_m.configure(state="disabled")
+            threading.Thread(target=self.run_manifest, args=(d,), daemon=True).start()
+
+    def run_manifest(self, d):
+        def prog(n, size):
+            self.after(0, lambda: self.lbl_m.configure(text=f"{n} archivos, {fmt_bytes(size)} procesados..."))
+        try:
+            r = self.logic.build_manifest(d, progress=prog)
+            rate = r["bytes"] / r["seconds"] if r["seconds"] else 0
+            msg = f"✅ {r['files']} archivos, {fmt_bytes(r['bytes'])} en {r['seconds']:.1f}s ({fmt_bytes(rate)}/s)\n{r['out']}"
+            if r["errors"]: msg += f"\n⚠️ {len(r['errors'])} archivos ilegibles"
+        except Exception as e:
+            msg = f"❌ Error: {e}"
+        self.after(0, lambda: (self.lbl_m.configure(text=msg), self.btn_m.configure(state="normal")))
+
+    def do_verify(self):
+        d = filedialog.askdirectory()
+        self.lift()
+        if d:
+            self.btn_v.configure(state="disabled")
+            threading.Thread(target=self.run_verify, args=(d, bool(self.chk_par.get())), daemon=True).start()
+
+    def run_verify(self, d, paranoid):
+        def prog(n, size):
+            self.after(0, lambda: self.lbl_m.configure(text=f"Verificando... {n} archivos rehasheados ({fmt_bytes(size)})"))
+        try:
+            r = self.logic.verify(d, paranoid=paranoid, progress=prog)
+            r["report"] = self.logic.save_report(r)
+        except FileNotFoundError:
+            r = {"error": "No existe baseline para esta carpeta. Genere primero el manifiesto."}
+        except Exception as e:
+            r = {"error": str(e)}
+        self.after(0, lambda: self.show_verify(r))
+
+    def show_verify(self, r):
+        self.btn_v.configure(state="normal")
+        if "error" in r:
+            self.lbl_m.configure(text=f"❌ {r['error']}")
+            return
+        head = "✅ SIN CAMBIOS" if r["ok"] else "❌ CAMBIOS DETECTADOS"
+        self.lbl_m.configure(text=f"{head}: {len(r['added'])} nuevos, {len(r['removed'])} eliminados, {len(r['modified'])} modificados, "
+                                  f"{r['unchanged']} intactos ({r['rehashed']} rehasheados) en {r['seconds']:.1f}s\n{r['report']}")
+        rows = [("MODIFICADO", x["path"], x["reason"]) for x in r["modified"]]
+        rows += [("NUEVO", x, "") for x in r["added"]] + [("ELIMINADO", x, "") for x in r["removed"]]
+        if rows: self.tbl_v.pack(fill="x", padx=15, pady=(0, 10))
+        else: self.tbl_v.pack_forget()
+        self.tbl_v.set_rows(rows)
+
+    def do_watch(self):
+        if self.watcher:
+            self.watcher.stop()
+            self.btn_w.configure(state="disabled")
+            return
+        d = filedialog.askdirectory()
+        self.lift()
+        if not d: return
+        try: self.watcher = GuardexWatcher(self.logic, [d])
+        except FileNotFoundError:
+            self.lbl_w.configure(text="❌ No existe baseline para esta carpeta. Genere primero el manifiesto.")
+            return
+        self.btn_w.configure(text="DETENER", fg_color="#333")
+        self.lbl_w.configure(text=f"Vigilando {d}\n{self.watcher.log_path}")
+        threading.Thread(target=self.run_watch, args=(self.watcher,), daemon=True).start()
+        self.after(WATCH_POLL, self.poll_watch)
+
+    def run_watch(self, w):
+        try:
+            for ev in w.watch(): self.w_queue.put(ev)
+        except Exception as e:
+            self.w_queue.put(w.event("ERROR", "", "", str(e)))
+        self.w_queue.put(None)
+
+    def poll_watch(self):
+        done, new = False, False
+        while True:
+            try: ev = self.w_queue.get_nowait()
+            except queue.Empty: break
+            if ev is None:
+                done = True
+                continue
+            self.w_rows.append((ev["time"].replace("T", " "), ev["event"], os.path.join(os.path.basename(ev["root"]), ev["path"]) if ev["path"] else ev["root"], ev["detail"]))
+            new = True
+        if new: self.tbl_w.set_rows(self.w_rows[::-1])
+        if done:
+            self.watcher = None
+            self.btn_w.configure(text="VIGILAR CARPETA", fg_color=COLOR_ACENTO, state="normal")
+            self.lbl_w.configure(text="Vigilancia detenida.")
+        else: self.after(WATCH_POLL, self.poll_watch)
+
     def do_log(self):
-        k = self.e_k.get()
+        if self.search_stop:
+            self.search_stop.set()
+            return
+        k = self.e_k.get().strip()
         if not k: return
+        regex = bool(self.chk_re.get())
+        patterns = [k] if regex else [p.strip() for p in k.split(",") if p.strip()]
+        if regex:
+            try: re.compile(k)
+            except re.error as e:
+                self.lbl_l.configure(text=f"❌ Expresión regular inválida: {e}")
+                return
         d = filedialog.askdirectory()
         self.lift()
-        if d:
-            threading.Thread(target=self.run_search, args=(d, k)).start()
+        if not d: return
+        self.l_hits = []
+        self.tbl_l.set_rows([])
+        self.txt_ctx.delete("1.0", "end")
+        self.search_stop = threading.Event()
+        self.btn_l.configure(text="DETENER", fg_color="#333")
+        self.lbl_l.configure(text="Buscando...")
+        args = (d, patterns, regex, bool(self.chk_ic.get()), int(self.opt_ctx.get()), self.search_stop, bool(self.chk_ix.get()) and not regex, bool(self.chk_sub.get()))
+        threading.Thread(target=self.run_search, args=args, daemon=True).start()
+        self.after(WATCH_POLL, self.poll_search)
 
-    def run_search(self, d, k):
-        matches = self.logic.search_recursive(d, k)
-        self.after(0, lambda: self.show_matches(matches))
+    def run_search(self, d, patterns, regex, ignore_case, context, stop, use_index=False, substring=False):
+        stats = {}
+        t0 = time.time()
+        if use_index and all(tokens(p) for p in patterns):
+            prog = lambda n, size: self.after(0, lambda: self.lbl_l.configure(text=f"Actualizando índice... {n} archivos, {fmt_bytes(size)} nuevos"))
+            gen = self.logic.index_search(d, patterns, ignore_case, prog, stats, substring)
+        else: gen = self.logic.search_recursive(d, patterns, regex, ignore_case, context, stats=stats)
+        try:
+            for h in gen:
+                h["path"] = os.path.relpath(h["path"], d)
+                self.l_queue.put(h)
+                if stop.is_set() or stats["hits"] >= SEARCH_ROWS: break
+        except Exception as e:
+            stats["errors"] = stats.get("errors", []) + [str(e)]
+        finally: gen.close()
+        stats["seconds"] = time.time() - t0
+        stats["stopped"] = stop.is_set() or stats.get("hits", 0) >= SEARCH_ROWS
+        self.l_queue.put(stats)
 
-    def show_matches(self, matches):
-        for w in self.scr_l.winfo_children(): w.destroy()
-        if not matches:
-            ctk.CTkLabel(self.scr_l, text="No se encontraron coincidencias.").pack()
+    def poll_search(self):
+        done, n = None, len(self.l_hits)
+        while True:
+            try: h = self.l_queue.get_nowait()
+            except queue.Empty: break
+            if "text" in h: self.l_hits.append(h)
+            else: done = h
+        if len(self.l_hits) > n: self.tbl_l.set_rows([(h["path"], h["line"], h["pattern"], h["text"].strip()) for h in self.l_hits])
+        if done is None:
+            self.lbl_l.configure(text=f"Buscando... {len(self.l_hits)} coincidencias")
+            self.after(WATCH_POLL, self.poll_search)
             return
-        for m in matches:
-            ctk.CTkLabel(self.scr_l, text=m, anchor="w", text_color="gray").pack(fill="x")
\ No newline at end of file
+        self.search_stop = None
+        self.btn_l.configure(text="BUSCAR EN CARPETA", fg_color=COLOR_ACENTO)
+        msg = f"{len(self.l_hits)} coincidencias en {done.get('files', 0)} archivos ({fmt_bytes(done.get('bytes', 0))}) en {done['seconds']:.1f}s"
+        if "indexed" in done: msg = f"{len(self.l_hits)} coincidencias vía índice en {done['seconds']:.2f}s ({done['indexed']} de {done['files']} archivos reindexados, {fmt_bytes(done['bytes'])} nuevos)"
+        if done["stopped"]: msg += " (búsqueda interrumpida)"
+        if done.get("errors"): msg += f" | ⚠️ {len(done['errors'])} errores"
+        self.lbl_l.configure(text=msg if self.l_hits else "No se encontraron coincidencias.")
+
+    def show_context(self, i):
+        h = self.l_hits[i]
+        n = h["line"] - len(h.get("before", []))
+        lines = [f"{n + j:>8}  {t}" for j, t in enumerate(h.get("before", []))] + [f"{h['line']:>8} > {h['text']}"]
+        lines += [f"{h['line'] + 1 + j:>8}  {t}" for j, t in enumerate(h.get("after", []))]
+        self.txt_ctx.delete("1.0", "end")
+        self.txt_ctx.insert("1.0", f"{h['path']}\n" + "\n".join(lines))
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Guardex integrity tools")
+    ap.add_argument("--manifest", metavar="DIR")
+    ap.add_argument("--verify", metavar="DIR")
+    ap.add_argument("--baseline", help="manifiesto a usar en --verify (por defecto el de la carpeta)")
+    ap.add_argument("--paranoid", action="store_true")
+    ap.add_argument("--watch", metavar="DIR", nargs="+")
+    ap.add_argument("--log", help="fichero JSONL de eventos para --watch")
+    ap.add_argument("--search", metavar="DIR")
+    ap.add_argument("-e", "--pattern", action="append", help="palabra clave o regex (repetible)")
+    ap.add_argument("--regex", action="store_true")
+    ap.add_argument("-i", "--ignore-case", action="store_true")
+    ap.add_argument("-C", "--context", type=int, default=0)
+    ap.add_argument("--index", metavar="DIR", help="crea o actualiza el índice persistente de la carpeta")
+    ap.add_argument("--use-index", action="store_true", help="responde --search desde el índice")
+    ap.add_argument("--substring", action="store_true", help="con --use-index, busca también dentro de otras palabras (recorre todo el vocabulario)")
+    ap.add_argument("--out")
+    ap.add_argument("--workers", type=int)
+    ap.add_argument("--algos", default=",".join(DIGESTS))
+    args = ap.parse_args()
+    logic = GuardexLogic()
+    prog = lambda n, size: print(f"\r{n} archivos, {fmt_bytes(size)}", end="", flush=True, file=sys.stderr)
+    if args.manifest:
+        r = logic.build_manifest(args.manifest, args.out, tuple(args.algos.split(",")), args.workers, prog)
+        print(f"\n{r['files']} archivos, {fmt_bytes(r['bytes'])} en {r['seconds']:.1f}s -> {r['out']}")
+        for e in r["errors"]: print("ERROR", e)
+    elif args.verify:
+        r = logic.verify(args.verify, args.baseline, args.paranoid, workers=args.workers, progress=prog)
+        print(file=sys.stderr)
+        for x in r["modified"]: print(f"MODIFICADO\t{x['path']}\t{x['reason']}")
+        for x in r["added"]: print(f"NUEVO\t{x}")
+        for x in r["removed"]: print(f"ELIMINADO\t{x}")
+        for e in r["errors"]: print("ERROR", e)
+        print(f"{r['unchanged']} intactos, {r['rehashed']} rehasheados en {r['seconds']:.1f}s -> {logic.save_report(r)}", file=sys.stderr)
+        sys.exit(0 if r["ok"] else 1)
+    elif args.watch:
+        w = GuardexWatcher(logic, args.watch, args.log, workers=args.workers)
+        print(f"Eventos -> {w.log_path}", file=sys.stderr)
+        try:
+            for ev in w.watch(): print(f"{ev['time']}\t{ev['event']}\t{os.path.join(ev['root'], ev['path']) if ev['path'] else ev['root']}\t{ev['detail']}", flush=True)
+        except KeyboardInterrupt: pass
+    elif args.search:
+        if not args.pattern: ap.error("--search requiere al menos un --pattern")
+        stats = {}
+        if args.use_index and not args.regex and all(tokens(p) for p in args.pattern):
+            hits = logic.index_search(args.search, args.pattern, args.ignore_case, stats=stats, substring=args.substring)
+        else: hits = logic.search_recursive(args.search, args.pattern, args.regex, args.ignore_case, args.context, args.workers, stats)
+        for h in hits:
+            for j, t in enumerate(h.get("before", [])): print(f"{h['path']}-{h['line'] - len(h['before']) + j}-{t}")
+            print(f"{h['path']}:{h['line']}:{h['text']}")
+            for j, t in enumerate(h.get("after", [])): print(f"{h['path']}-{h['line'] + 1 + j}-{t}")
+            if args.context: print("--")
+        if "indexed" in stats: print(f"{stats['hits']} coincidencias vía índice ({stats['indexed']} de {stats['files']} archivos reindexados, {fmt_bytes(stats['bytes'])} nuevos)", file=sys.stderr)
+        else: print(f"{stats['hits']} coincidencias en {stats['files']} archivos ({fmt_bytes(stats['bytes'])})", file=sys.stderr)
+        for e in stats["errors"]: print("ERROR", e, file=sys.stderr)
+    elif args.index:
+        ix = LogIndex()
+        r = ix.update(args.index, progress=prog)
+        ix.close()
+        print(f"\n{r['indexed']} de {r['files']} archivos indexados ({r['reset']} reiniciados, {r['removed']} eliminados), {fmt_bytes(r['bytes'])} en {r['seconds']:.1f}s")
+    else:
+        ap.error("indique --manifest DIR, --verify DIR, --watch DIR, --search DIR o --index DIR")
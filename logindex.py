@@ -0,0 +1,209 @@
+import os
+import time
+import array
+import sqlite3
+import hashlib
+from itertools import accumulate
+
+from logsearch import LOG_EXTS, MAX_LINE, iter_files
+
+INDEX_DB = os.path.join(".kinix", "guardex", "logindex.db")
+TOKEN_TABLE = bytes(c + 32 if 65 <= c <= 90 else c if 48 <= c <= 57 or 97 <= c <= 122 or c in (95, 10) else 32 for c in range(256))
+TOKEN_MIN = 2
+TOKEN_MAX = 64
+CHUNK = 32 * 1024 * 1024
+HEAD_BYTES = 4096
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER,
+    mtime INTEGER,
+    ino INTEGER,
+    offset INTEGER,
+    lines INTEGER,
+    head TEXT,
+    head_len INTEGER
+);
+CREATE TABLE IF NOT EXISTS postings (token TEXT NOT NULL, file_id INTEGER NOT NULL, line0 INTEGER, off0 INTEGER, lines BLOB NOT NULL, offsets BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS vocab (token TEXT PRIMARY KEY) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS roots (path TEXT PRIMARY KEY, updated REAL);
+CREATE INDEX IF NOT EXISTS postings_token ON postings(token, file_id);
+CREATE INDEX IF NOT EXISTS postings_file ON postings(file_id);
+"""
+
+def tokens(text):
+    if isinstance(text, str): text = text.encode()
+    return list(dict.fromkeys(t.decode() for t in text.translate(TOKEN_TABLE).split() if TOKEN_MIN <= len(t) <= TOKEN_MAX))
+
+def head_hash(f, n):
+    f.seek(0)
+    return hashlib.sha1(f.read(n)).hexdigest()
+
+class LogIndex:
+    def __init__(self, path=INDEX_DB):
+        if os.path.dirname(path): os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        if self.db.execute("SELECT 1 FROM postings LIMIT 1").fetchone() and not self.db.execute("SELECT 1 FROM vocab LIMIT 1").fetchone():
+            self.db.execute("INSERT OR IGNORE INTO vocab(token) SELECT DISTINCT token FROM postings")
+            self.db.commit()
+
+    def drop_file(self, fid):
+        self.db.execute("DELETE FROM postings WHERE file_id = ?", (fid,))
+
+    def update(self, folder, exts=LOG_EXTS, progress=None):
+        folder = os.path.abspath(folder)
+        t0 = time.time()
+        r = {"folder": folder, "files": 0, "indexed": 0, "reset": 0, "removed": 0, "bytes": 0}
+        known = {row[1]: row for row in self.db.execute("SELECT id, path, mtime, ino, offset, lines, head, head_len, size FROM files")}
+        seen = set()
+        for path, st in iter_files(folder, exts):
+            seen.add(path)
+            r["files"] += 1
+            row = known.get(path)
+            if row and row[2] == st.st_mtime_ns and row[3] == st.st_ino and row[8] == st.st_size: continue
+            try: r["bytes"] += self.index_file(path, row, r)
+            except OSError: continue
+            self.db.commit()
+            if progress: progress(r["files"], r["bytes"])
+        prefix = folder.rstrip(os.sep) + os.sep
+        for path, row in known.items():
+            if path.startswith(prefix) and path not in seen:
+                self.drop_file(row[0])
+                self.db.execute("DELETE FROM files WHERE id = ?", (row[0],))
+                r["removed"] += 1
+        self.db.execute("INSERT OR REPLACE INTO roots(path, updated) VALUES (?, ?)", (folder, time.time()))
+        self.db.commit()
+        r["seconds"] = time.time() - t0
+        return r
+
+    def index_file(self, path, row, r):
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if row is None:
+                fid = self.db.execute("INSERT INTO files(path, offset, lines) VALUES (?, 0, 0)", (path,)).lastrowid
+                offset = lines = 0
+            else:
+                fid, offset, lines = row[0], row[4], row[5]
+                if row[6] is None or row[3] != st.st_ino or st.st_size < offset or head_hash(f, row[7]) != row[6]:
+                    self.drop_file(fid)
+                    offset = lines = 0
+                    r["reset"] += 1
+                else: self.db.execute("DELETE FROM postings WHERE file_id = ? AND off0 >= ?", (fid, offset))
+            start, tail = offset, 0
+            size = CHUNK
+            f.seek(offset)
+            while True:
+                buf = f.read(size)
+                if not buf: break
+                eof = len(buf) < size
+                cut = buf.rfind(b"\n") + 1
+                if not cut and not eof:
+                    size *= 2
+                    f.seek(offset)
+                    continue
+                size = CHUNK
+                if cut:
+                    lines += self.index_chunk(fid, buf[:cut], offset, lines)
+                    offset += cut
+                    f.seek(offset)
+                if eof:
+                    if cut < len(buf): self.index_chunk(fid, buf[cut:], offset, lines)
+                    tail = len(buf) - cut
+                    break
+            n = min(HEAD_BYTES, offset + tail)
+            self.db.execute("UPDATE files SET size=?, mtime=?, ino=?, offset=?, lines=?, head=?, head_len=? WHERE id=?",
+                            (st.st_size, st.st_mtime_ns, st.st_ino, offset, lines, head_hash(f, n), n, fid))
+        r["indexed"] += 1
+        return offset + tail - start
+
+    def index_chunk(self, fid, buf, base, first):
+        post = {}
+        lines = buf.translate(TOKEN_TABLE).split(b"\n")
+        for i, line in enumerate(lines):
+            for t in line.split():
+                p = post.get(t)
+                if p is None: post[t] = [i]
+                elif p[-1] != i: p.append(i)
+        starts = list(accumulate((len(line) + 1 for line in lines), initial=0))
+        post = {t.decode(): p for t, p in post.items() if TOKEN_MIN <= len(t) <= TOKEN_MAX}
+        self.db.executemany("INSERT INTO postings(token, file_id, line0, off0, lines, offsets) VALUES (?, ?, ?, ?, ?, ?)",
+                            ((t, fid, first + 1, base, array.array("I", p).tobytes(), array.array("I", [starts[i] for i in p]).tobytes())
+                             for t, p in post.items()))
+        self.db.executemany("INSERT OR IGNORE INTO vocab(token) VALUES (?)", ((t,) for t in post))
+        return len(lines) - 1
+
+    def expand(self, kw, substring=False):
+        parts = kw.encode().translate(TOKEN_TABLE).split()
+        if not parts: return []
+        left, right = kw.encode()[:1].translate(TOKEN_TABLE).strip(), kw.encode()[-1:].translate(TOKEN_TABLE).strip()
+        out = []
+        for i, t in enumerate(parts):
+            if not TOKEN_MIN <= len(t) <= TOKEN_MAX: continue
+            t = t.decode()
+            lo, hi = substring and left and i == 0, right and i == len(parts) - 1
+            if lo and hi: q, args = "SELECT token FROM vocab WHERE instr(token, ?) > 0", (t,)
+            elif lo: q, args = "SELECT token FROM vocab WHERE substr(token, -?) = ?", (len(t), t)
+            elif hi: q, args = "SELECT token FROM vocab WHERE token >= ? AND token < ?", (t, t + "\x7f")
+            else:
+                out.append([t])
+                continue
+            out.append([row[0] for row in self.db.execute(q, args)])
+        return out
+
+    def lookup(self, toks, files):
+        hits = {}
+        for token in toks:
+            for fid, line0, off0, lines, offsets in self.db.execute("SELECT file_id, line0, off0, lines, offsets FROM postings WHERE token = ?", (token,)):
+                if fid not in files: continue
+                ls, offs = array.array("I"), array.array("I")
+                ls.frombytes(lines)
+                offs.frombytes(offsets)
+                hits.setdefault(fid, {}).update(zip((line0 + i for i in ls), (off0 + o for o in offs)))
+        return hits
+
+    def query(self, keywords, ignore_case=True, folder=None, substring=False):
+        if isinstance(keywords, str): keywords = [keywords]
+        files = {fid: path for fid, path in self.db.execute("SELECT id, path FROM files")}
+        if folder:
+            prefix = os.path.abspath(folder).rstrip(os.sep) + os.sep
+            files = {fid: path for fid, path in files.items() if path.startswith(prefix)}
+        found = {}
+        for kw in keywords:
+            toks = self.expand(kw, substring)
+            if not toks: raise ValueError(f"'{kw}' no contiene términos indexables")
+            cand = None
+            for hits in sorted((self.lookup(t, files) for t in toks), key=lambda h: sum(map(len, h.values()))):
+                if cand is None: cand = hits
+                else: cand = {fid: {ln: off for ln, off in lines.items() if ln in hits.get(fid, ())} for fid, lines in cand.items() if fid in hits}
+            for fid, lines in cand.items():
+                for ln, off in lines.items(): found.setdefault((files[fid], ln), (off, []))[1].append(kw)
+        f = cur = None
+        try:
+            for (path, ln), (off, kws) in sorted(found.items()):
+                if path != cur:
+                    if f: f.close()
+                    cur, f = path, None
+                    try: f = open(path, "rb")
+                    except OSError: continue
+                if f is None: continue
+                f.seek(off)
+                raw = f.readline().rstrip(b"\r\n")
+                line = raw.lower() if ignore_case else raw
+                for kw in kws:
+                    k = kw.encode()
+                    if (k.lower() if ignore_case else k) in line:
+                        yield {"path": path, "line": ln, "offset": off, "text": raw[:MAX_LINE].decode("utf-8", errors="replace"), "pattern": kw}
+                        break
+        finally:
+            if f: f.close()
+
+    def roots(self):
+        return [row[0] for row in self.db.execute("SELECT path FROM roots ORDER BY path")]
+
+    def close(self):
+        self.db.close()
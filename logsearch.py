@@ -0,0 +1,186 @@
+import os
+import re
+import mmap
+from functools import lru_cache
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+LOG_EXTS = (".log", ".txt", ".xml", ".json")
+RANGE_BYTES = 64 * 1024 * 1024
+COUNT_CHUNK = 8 * 1024 * 1024
+RANGE_HITS = 20000
+MAX_LINE = 512
+WINDOW = 16 * 1024 * 1024
+NOWHERE = float("inf")
+
+
+@lru_cache(maxsize=32)
+def compile_patterns(patterns, regex=False, ignore_case=False):
+    if not regex: return [p.encode().lower() if ignore_case else p.encode() for p in patterns]
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    rxs = [re.compile(p.encode(), flags) for p in patterns]
+    return rxs[0] if len(rxs) == 1 else re.compile(b"|".join(b"(?:%s)" % p.encode() for p in patterns), flags), rxs
+
+class LiteralFinder:
+    def __init__(self, buf, pats, lower, size):
+        self.buf, self.pats, self.lower, self.size = buf, pats, lower, size
+        self.overlap = max(len(p) for p in pats) - 1
+        self.w0 = self.w1 = 0
+
+    def load(self, w0, end):
+        if self.lower:
+            self.w0, self.w1 = w0, min(w0 + WINDOW, end)
+            self.win = self.buf[w0:min(self.w1 + self.overlap, self.size)].lower()
+        else: self.w0, self.w1, self.win = 0, self.size, self.buf
+        self.nxt = [-1] * len(self.pats)
+
+    def find(self, pos, end):
+        if not self.w0 <= pos < self.w1: self.load(pos, end)
+        while True:
+            best, idx = NOWHERE, 0
+            for i, p in enumerate(self.pats):
+                n = self.nxt[i]
+                if n < pos:
+                    k = self.win.find(p, pos - self.w0, min(end + len(p) - 1, self.w0 + len(self.win)) - self.w0)
+                    n = self.nxt[i] = NOWHERE if k < 0 or self.w0 + k >= self.w1 else self.w0 + k
+                if n < best: best, idx = n, i
+            if best < NOWHERE: return (best, idx) if best < end else None
+            if self.w1 >= end: return None
+            pos = self.w1
+            self.load(pos, end)
+
+class RegexFinder:
+    def __init__(self, buf, rx, rxs, size):
+        self.buf, self.rx, self.rxs, self.size = buf, rx, rxs, size
+
+    def find(self, pos, end):
+        m = self.rx.search(self.buf, pos, min(end + MAX_LINE, self.size))
+        if not m or m.start() >= end: return None
+        if len(self.rxs) == 1: return m.start(), 0
+        e = line_end(self.buf, m.start(), self.size)
+        line = self.buf[max(pos, self.buf.rfind(b"\n", pos, m.start()) + 1):e]
+        return m.start(), next((i for i, r in enumerate(self.rxs) if r.search(line)), 0)
+
+def iter_files(folder, exts=LOG_EXTS):
+    stack = [folder]
+    while stack:
+        d = stack.pop()
+        try: it = os.scandir(d)
+        except OSError: continue
+        with it:
+            entries = sorted(it, key=lambda e: e.name)
+        for e in reversed(entries):
+            try:
+                if e.is_dir(follow_symlinks=False): stack.append(e.path)
+            except OSError: pass
+        for e in entries:
+            try:
+                if e.is_file(follow_symlinks=False) and (not exts or e.name.endswith(exts)): yield e.path, e.stat(follow_symlinks=False)
+            except OSError: pass
+
+def count_lines(buf, start, end):
+    n = 0
+    for pos in range(start, end, COUNT_CHUNK): n += buf[pos:min(pos + COUNT_CHUNK, end)].count(b"\n")
+    return n
+
+def line_text(buf, s, e):
+    return buf[s:min(e, s + MAX_LINE)].decode("utf-8", errors="replace").rstrip("\r")
+
+def line_end(buf, pos, size):
+    e = buf.find(b"\n", pos, size)
+    return size if e < 0 else e
+
+def context_lines(buf, s, e, size, n):
+    before, after = [], []
+    b = s
+    while b > 0 and len(before) < n:
+        pb = buf.rfind(b"\n", 0, b - 1) + 1
+        before.insert(0, line_text(buf, pb, b - 1))
+        b = pb
+    a = e
+    while a < size - 1 and len(after) < n:
+        na = line_end(buf, a + 1, size)
+        after.append(line_text(buf, a + 1, na))
+        a = na
+    return before, after
+
+def search_range(path, start, end, spec, context=0, limit=RANGE_HITS):
+    compiled = compile_patterns(*spec)
+    hits = []
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        end = min(end, size)
+        if start >= end: return 0, hits, None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = min(size, len(mm))
+            pos = 0
+            if start:
+                p = mm.find(b"\n", start - 1, end)
+                pos = end if p < 0 else p + 1
+            if spec[1]: finder = RegexFinder(mm, *compiled, size)
+            else: finder = LiteralFinder(mm, compiled, spec[2], size)
+            stop = min(line_end(mm, end - 1, size) + 1, size)
+            line, counted = 0, start
+            while pos < end:
+                m = finder.find(pos, stop)
+                if not m: break
+                s = max(pos, mm.rfind(b"\n", pos, m[0]) + 1)
+                e = line_end(mm, m[0], size)
+                line += count_lines(mm, counted, s)
+                counted = s
+                h = {"offset": s, "line": line, "text": line_text(mm, s, e), "pattern": spec[0][m[1]]}
+                if context: h["before"], h["after"] = context_lines(mm, s, e, size, context)
+                hits.append(h)
+                pos = e + 1
+                if len(hits) >= limit and pos < end: return line + count_lines(mm, counted, pos), hits, pos
+            return line + count_lines(mm, counted, end), hits, None
+
+def search(folder, patterns, regex=False, ignore_case=False, context=0, workers=None, exts=LOG_EXTS, stats=None, range_bytes=RANGE_BYTES):
+    spec = (tuple(patterns), bool(regex), bool(ignore_case))
+    if not spec[0]: return
+    compile_patterns(*spec)
+    stats = {} if stats is None else stats
+    stats.update({"files": 0, "bytes": 0, "hits": 0, "errors": []})
+    workers = workers or os.cpu_count() or 1
+    pending = deque()
+    failed = set()
+    base = 0
+
+    def tasks():
+        for path, st in iter_files(folder, exts):
+            size = st.st_size
+            stats["files"] += 1
+            stats["bytes"] += size
+            for a in range(0, size, range_bytes):
+                if path in failed: break
+                yield path, a, min(a + range_bytes, size)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            it = tasks()
+            while True:
+                for t in it:
+                    pending.append((t, pool.submit(search_range, *t, spec, context)))
+                    if len(pending) >= workers * 4: break
+                if not pending: break
+                (path, start, end), fut = pending.popleft()
+                if path in failed:
+                    fut.cancel()
+                    continue
+                if start == 0: base = 0
+                try: nl, hits, resume = fut.result()
+                except (OSError, ValueError) as e:
+                    stats["errors"].append(f"{path}: {e}")
+                    failed.add(path)
+                    continue
+                if resume is not None:
+                    t = (path, resume, end)
+                    pending.appendleft((t, pool.submit(search_range, *t, spec, context)))
+                for h in hits:
+                    h["path"] = path
+                    h["line"] += base + 1
+                    stats["hits"] += 1
+                    yield h
+                base += nl
+        finally:
+            for _, fut in pending: fut.cancel()
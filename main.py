@@ -245,10 +245,15 @@ class KinixDashboard(ctk.CTk):
 
         ctk.CTkLabel(header, text="| Archivos Generados", font=("Roboto", 16), text_color="gray").pack(side="left", padx=10, pady=(8,0))
 
+        log_root = "logs"
+
+        btn_batch = ctk.CTkButton(header, text="ANALIZAR TODO", width=120, height=28, fg_color=COLOR_ACENTO_1, hover_color=COLOR_ACENTO_HOVER, font=("Roboto", 10, "bold"),
+                                  command=lambda: self.abrir_modulo_con_carpeta(log_root))
+        btn_batch.pack(side="right", pady=(8, 0))
+
         list_container = ctk.CTkFrame(self.main_area, fg_color="transparent")
         list_container.pack(fill="both", expand=True, padx=10, pady=(0, 50))
 
-        log_root = "logs"
         found_files = []
 
         if os.path.exists(log_root):
@@ -488,6 +493,20 @@ class KinixDashboard(ctk.CTk):
         else:
             GenericModuleWindow(self, "MAYA", "Modulo no disponible")
 
+    def abrir_modulo_con_carpeta(self, path):
+        if MAYA_AVAILABLE:
+            try:
+                if self.maya_instance:
+                    try:
+                        self.maya_instance.destroy()
+                    except:
+                        pass
+                self.maya_instance = MayaWindow(self, carpeta_pre_cargada=path)
+            except Exception:
+                GenericModuleWindow(self, "MAYA", "Modulo no disponible")
+        else:
+            GenericModuleWindow(self, "MAYA", "Modulo no disponible")
+
 if __name__ == "__main__":
     app = KinixDashboard()
     app.mainloop()
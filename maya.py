@@ -1,11 +1,30 @@
 import customtkinter as ctk
 from tkinter import filedialog
 import os
+import io
 import threading
-import time
+import mmap
 import re
+import json
+import hashlib
+import heapq
+import bisect
+import calendar
+import datetime
+import ipaddress
+import argparse
+from array import array
+from collections import OrderedDict
+from re import _parser as sre_parse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from PIL import Image
 
+try:
+    import numpy as np
+    NP_OK = True
+except ImportError:
+    NP_OK = False
+
 COLOR_FONDO = "#171718"
 COLOR_SIDE = "#121213"
 COLOR_BUBBLE_BOT = "#1F1F21"
@@ -15,6 +34,50 @@ COLOR_SAFE = "#00E676"
 COLOR_WARN = "#FFEA00"
 COLOR_DANGER = "#FF3D00"
 
+MAX_OFFSETS = 50
+CHUNK_SIZE = 1024 * 1024
+OVERLAP = 4096
+LINE_MAX = OVERLAP
+HEAVY_HITTERS = 200
+TOP_SOURCES = 5
+ALL_SOURCES = "*"
+SNIFF_BYTES = 4096
+LOG_EXTENSIONS = (".txt", ".log", ".csv", ".json")
+SEVERITY = {COLOR_SAFE: 0, COLOR_WARN: 1, COLOR_DANGER: 2}
+VERDICTS = {0: "OK", 1: "ALERTA", 2: "CRITICO"}
+STATE_DIR = ".kinix"
+FOLLOW_STATE = os.path.join(STATE_DIR, "maya_follow.json")
+FOLLOW_INTERVAL = 5000
+RESULT_CACHE = os.path.join(STATE_DIR, "maya_cache.json")
+CACHE_MAX_BYTES = 4 * 1024 * 1024
+CACHE_VERSION = 1
+FINGERPRINT_BYTES = 64 * 1024
+HEAD_BYTES = 1024
+EVENT_DIR = os.path.join(STATE_DIR, "maya_events")
+IP_PATTERN = r'\b(?:\d{1,3}\.){3}\d{1,3}\b'
+MONTHS = {m: i + 1 for i, m in enumerate([b"Jan", b"Feb", b"Mar", b"Apr", b"May", b"Jun", b"Jul", b"Aug", b"Sep", b"Oct", b"Nov", b"Dec"])}
+SYSLOG_RE = re.compile(rb'^([A-Z][a-z]{2}) +(\d{1,2}) (\d{2}):(\d{2}):(\d{2}) (\S+) ([^:\[\s]+)(?:\[\d+\])?: ?(.*)')
+ISO_RE = re.compile(rb'^(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})(?:\.\d+)?(Z|[+-]\d{2}:?\d{2})? (\S+) ([^:\[\s]+)(?:\[\d+\])?: ?(.*)')
+WEB_RE = re.compile(rb'^(\S+) \S+ \S+ \[(\d{2})/([A-Z][a-z]{2})/(\d{4}):(\d{2}):(\d{2}):(\d{2}) ([+-]\d{4})\] (.*)')
+EVENT_COLUMNS = {"ts": "q", "host": "I", "prog": "I", "ip": "I", "sig": "h", "off": "Q", "len": "I"}
+ASCII_LOWER = bytes.maketrans(bytes(range(65, 91)), bytes(range(97, 123)))
+ASCII_LOWER_STR = {c: c + 32 for c in range(65, 91)}
+
+def lower_text(text):
+    low = text.lower()
+    return low if len(low) == len(text) else text.translate(ASCII_LOWER_STR)
+
+def required_literal(p):
+    runs, run = [], []
+    for op, av in sre_parse.parse(p):
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        runs.append("".join(run))
+        run = []
+    runs.append("".join(run))
+    return max(runs, key=len).lower(), len(runs) == 1
+
 class SecurityEngine:
     def __init__(self):
         self.PORT_KNOWLEDGE = {
@@ -38,22 +101,107 @@ class SecurityEngine:
             "Brute Force": [r"failed password", r"authentication failure", r"too many attempts"],
             "Critical Errors": [r"fatal error", r"kernel panic", r"segmentation fault"]
         }
+        self.formats = [
+            ("autopentest", lambda h: h.startswith("TARGET:"), self.analyze_autopentest),
+            ("patchtrack", lambda h: h.startswith("REPORTE DE VERSIONES"), self.analyze_patchtrack),
+            ("golem", lambda h: h.startswith("IP,MAC,VENDOR"), self.analyze_golem),
+            ("syscare", lambda h: h.startswith("=== REPORTE SYSCARE ==="), self.analyze_syscare),
+        ]
+        self.compile_signatures()
+
+    def compile_signatures(self):
+        self.sig_index = []
+        parts = []
+        for threat, patterns in self.signatures.items():
+            for p in patterns:
+                parts.append(f"(?P<s{len(self.sig_index)}>{p})")
+                self.sig_index.append((threat, p))
+        self.matcher = re.compile("|".join(parts), re.IGNORECASE)
+        self.bmatcher = re.compile("|".join(parts).encode(), re.IGNORECASE)
+        self.sig_plans, self.bsig_plans = [], []
+        for _, p in self.sig_index:
+            lit, pure = required_literal(p)
+            self.sig_plans.append((lit, None if pure else re.compile(p, re.IGNORECASE)))
+            self.bsig_plans.append((lit.encode(), None if pure else re.compile(p.encode(), re.IGNORECASE)))
+        self.ip_re = re.compile(IP_PATTERN)
+        self.signature_id = hashlib.sha1(json.dumps([CACHE_VERSION, self.sig_index]).encode()).hexdigest()
+        self.bip_re = re.compile(IP_PATTERN.encode())
+
+    def new_hits(self):
+        return [{"threat": t, "pattern": p, "count": 0, "offsets": []} for t, p in self.sig_index]
+
+    def match_signatures(self, text, hits, base=0, pos=0, stop=None, endpos=None, on_hit=None):
+        if endpos is None: endpos = len(text)
+        if stop is None: stop = endpos
+        binary = not isinstance(text, str)
+        plans = self.bsig_plans if binary else self.sig_plans
+        found = []
+        nxt = [pos] * len(plans)
+        for w in range(pos, stop, CHUNK_SIZE):
+            ws = min(w + CHUNK_SIZE, stop)
+            we = min(ws + OVERLAP, endpos)
+            low = text[w:we].translate(ASCII_LOWER) if binary else lower_text(text[w:we])
+            for i, (lit, rx) in enumerate(plans):
+                for start, end in self.find_signature(text, low, w, max(nxt[i], w), ws, we, lit, rx):
+                    found.append((start, i, end))
+                    nxt[i] = end
+        found.sort()
+        for start, i, end in found:
+            h = hits[i]
+            h["count"] += 1
+            if len(h["offsets"]) < MAX_OFFSETS: h["offsets"].append(base + start)
+            if on_hit: on_hit(text, h["threat"], start, end)
+
+    def find_signature(self, text, low, pos, first, stop, endpos, lit, rx):
+        if rx is None:
+            limit = stop - pos + len(lit) - 1
+            k = low.find(lit, first - pos, limit)
+            while k >= 0:
+                yield pos + k, pos + k + len(lit)
+                k = low.find(lit, k + len(lit), limit)
+            return
+        if not lit:
+            for m in rx.finditer(text, first, endpos):
+                if m.start() >= stop: return
+                yield m.start(), m.end()
+            return
+        last = first
+        k = low.find(lit, first - pos)
+        while k >= 0:
+            a = pos + k
+            if a >= last:
+                m = rx.search(text, max(last, a - LINE_MAX), min(a + len(lit) + LINE_MAX, endpos))
+                if m:
+                    if m.start() >= stop: return
+                    yield m.start(), m.end()
+                    last = max(m.end(), m.start() + 1)
+            k = low.find(lit, k + 1)
+
+    def threat_totals(self, hits):
+        totals = {}
+        for h in hits:
+            if h["count"]: totals[h["threat"]] = totals.get(h["threat"], 0) + h["count"]
+        return totals
 
     def analyze(self, text):
-        if "TARGET:" in text and "|" in text:
-            return self.analyze_autopentest(text)
-        elif "REPORTE DE VERSIONES" in text:
-            return self.analyze_patchtrack(text)
-        elif "IP,MAC,VENDOR" in text:
-            return self.analyze_golem(text)
-        elif "=== REPORTE SYSCARE ===" in text:
-            return self.analyze_syscare(text)
-        else:
-            return self.analyze_generic(text)
+        _, fn = self.detect_format(text)
+        return fn(io.StringIO(text)) if fn else self.analyze_generic(text)
+
+    def detect_format(self, head):
+        head = head[:SNIFF_BYTES]
+        if not isinstance(head, str): head = head.decode("utf-8", errors="ignore")
+        head = head.lstrip("\ufeff \t\r\n")
+        for name, match, fn in self.formats:
+            if match(head): return name, fn
+        return "generic", None
 
-    def analyze_autopentest(self, text):
-        ports_found = re.findall(r'\|\s+(\d+)\s+\|', text)
-        risks = re.findall(r'\|\s+(CRITICO|ALERTA)\s+', text)
+    def analyze_autopentest(self, lines):
+        ports_found, risks, critical = {}, 0, False
+        for line in lines:
+            for p in re.findall(r'\|\s+(\d+)\s+\|', line): ports_found[p] = ports_found.get(p, 0) + 1
+            for r in re.findall(r'\|\s+(CRITICO|ALERTA)\s+', line):
+                risks += 1
+                critical = critical or r == "CRITICO"
         
         explanations = []
         for p in ports_found:
@@ -62,10 +210,10 @@ class SecurityEngine:
             explanations.append(f"• Puerto {p}: {desc}")
         
         summary = " TIPO: LOG DE PUERTOS (AutoPentest)\n"
-        summary += f" [PORTS]: {', '.join(ports_found)}\n"
-        summary += f" [RISKS]: {len(risks)} alertas detectadas."
+        summary += f" [PORTS]: {', '.join(p if n == 1 else f'{p} (x{n})' for p, n in ports_found.items())}\n"
+        summary += f" [RISKS]: {risks} alertas detectadas."
 
-        if "CRITICO" in risks:
+        if critical:
             color = COLOR_DANGER
             desc = "He detectado puertos de ALTO RIESGO abiertos (posiblemente FTP, Telnet o SMB). \n\n" + "\n".join(explanations)
         elif ports_found:
@@ -77,38 +225,47 @@ class SecurityEngine:
             
         return summary, color, desc
 
-    def analyze_patchtrack(self, text):
-        outdated = re.findall(r'(\S+)\s+\S+\s+\S+\s+(OUTDATED|DESACTUALIZADO)', text)
+    def analyze_patchtrack(self, lines):
+        outdated, pkgs = 0, {}
+        for line in lines:
+            for m in re.findall(r'(\S+)\s+\S+\s+\S+\s+(OUTDATED|DESACTUALIZADO)', line):
+                outdated += 1
+                pkgs[m[0]] = None
         
         summary = " TIPO: CONTROL DE VERSIONES (PatchTrack)\n"
-        summary += f" [MODULES]: {len(outdated)} desactualizados."
+        summary += f" [MODULES]: {outdated} desactualizados."
 
         if outdated:
-            pkgs = [x[0] for x in outdated]
             color = COLOR_WARN
-            desc = f"Encontré {len(outdated)} librerías obsoletas: {', '.join(pkgs)}. \n\nLas versiones antiguas pueden contener vulnerabilidades (CVEs) ya parcheadas en versiones nuevas. Recomiendo actualizar con 'pip install --upgrade'."
+            desc = f"Encontré {outdated} librerías obsoletas: {', '.join(pkgs)}. \n\nLas versiones antiguas pueden contener vulnerabilidades (CVEs) ya parcheadas en versiones nuevas. Recomiendo actualizar con 'pip install --upgrade'."
         else:
             color = COLOR_SAFE
             desc = "Todas las librerías analizadas están actualizadas a su última versión estable. Buen mantenimiento."
             
         return summary, color, desc
 
-    def analyze_golem(self, text):
-        devices = re.findall(r'(\d+\.\d+\.\d+\.\d+),', text)
-        vendors = re.findall(r',([^,\n]+)$', text, re.MULTILINE)
+    def analyze_golem(self, lines):
+        devices, vendors = 0, set()
+        for line in lines:
+            devices += len(re.findall(r'(\d+\.\d+\.\d+\.\d+),', line))
+            m = re.search(r',([^,\n]+)$', line.rstrip("\r\n"))
+            if m: vendors.add(m.group(1))
         
         summary = " TIPO: ESCANEO DE RED (Golem)\n"
-        summary += f" [HOSTS]: {len(devices)} dispositivos encontrados."
+        summary += f" [HOSTS]: {devices} dispositivos encontrados."
 
         color = COLOR_SAFE
-        desc = f"He mapeado {len(devices)} dispositivos conectados a la red local. \n\nFabricantes detectados: {', '.join(list(set(vendors))[:5])}."
+        desc = f"He mapeado {devices} dispositivos conectados a la red local. \n\nFabricantes detectados: {', '.join(list(vendors)[:5])}."
         
         return summary, color, desc
 
-    def analyze_syscare(self, text):
+    def analyze_syscare(self, lines):
         summary = " TIPO: MONITOR DE SISTEMA (SysCare)\n"
-        cpu = re.search(r'cpu_percent: (\d+\.?\d*)', text)
-        ram = re.search(r'ram_percent: (\d+\.?\d*)', text)
+        cpu = ram = None
+        for line in lines:
+            cpu = cpu or re.search(r'cpu_percent: (\d+\.?\d*)', line)
+            ram = ram or re.search(r'ram_percent: (\d+\.?\d*)', line)
+            if cpu and ram: break
         
         cpu_val = float(cpu.group(1)) if cpu else 0
         ram_val = float(ram.group(1)) if ram else 0
@@ -127,40 +284,584 @@ class SecurityEngine:
             
         return summary, color, desc
 
+    def analyze_file(self, path, progress=None):
+        return self.report(self.scan_file(path, progress))
+
+    def report(self, res):
+        if isinstance(res, GenericScan): return self.report_generic(res)
+        return res if isinstance(res, tuple) else self.analyze(res)
+
+    def scan_file(self, path, progress=None):
+        with open(path, "rb") as f:
+            _, fn = self.detect_format(f.read(SNIFF_BYTES))
+            if fn:
+                f.seek(0)
+                return fn(io.TextIOWrapper(f, encoding="utf-8", errors="ignore"))
+        try:
+            return self.scan_mmap(path, progress=progress)
+        except (OSError, ValueError):
+            return self.scan_stream(path, progress=progress)
+
+    def scan_stream(self, path, chunk_size=CHUNK_SIZE, progress=None):
+        total = os.path.getsize(path)
+        with open(path, "rb") as f:
+            scan = GenericScan(self, binary=True)
+            b = f.read(chunk_size)
+            while b:
+                scan.feed(b)
+                if progress: progress(scan.size, total, scan)
+                b = f.read(chunk_size)
+            scan.feed(b"", final=True)
+        return scan
+
+    def scan_mmap(self, path, window=CHUNK_SIZE, progress=None):
+        with open(path, "rb") as f:
+            total = os.fstat(f.fileno()).st_size
+            scan = GenericScan(self, binary=True)
+            if total <= window:
+                scan.feed(f.read(), final=True)
+                return scan
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                self.scan_range(mm, scan, 0, total, window, progress)
+        return scan
+
+    def scan_range(self, mm, scan, start, end, window=CHUNK_SIZE, progress=None):
+        scan.sig_pos = max(scan.sig_pos, start)
+        scan.ip_pos = max(scan.ip_pos, start)
+        for pos in range(start, end, window):
+            stop = min(pos + window, end)
+            scan.scan_window(mm, 0, stop, min(stop + OVERLAP, end))
+            if progress: progress(stop, end, scan)
+        scan.size = end
+
     def analyze_generic(self, text):
-        text_lower = text.lower()
-        risk_score = 0
-        detected_threats = []
-        
-        for threat, patterns in self.signatures.items():
-            for p in patterns:
-                if re.search(p, text_lower):
-                    detected_threats.append(threat)
-                    risk_score += 20
-                    break
-        
-        ips = list(set(re.findall(r'\b(?:\d{1,3}\.){3}\d{1,3}\b', text)))
+        scan = GenericScan(self)
+        scan.feed(text, final=True)
+        return self.report_generic(scan)
+
+    def report_generic(self, scan):
+        hits = scan.hits
+        totals = self.threat_totals(hits)
+        detected_threats = list(totals)
+        risk_score = 20 * len(detected_threats)
+        ips = scan.sources[ALL_SOURCES]
         
         summary = " TIPO: LOG GENÉRICO / SISTEMA\n"
-        if detected_threats: summary += f" [THREATS]: {', '.join(detected_threats)}\n"
-        if ips: summary += f" [IPS]: {len(ips)} detectadas."
-        if not detected_threats and not ips: summary += " [DATA]: Sin patrones de ataque."
+        if detected_threats: summary += f" [THREATS]: {', '.join(f'{t} ({n})' for t, n in totals.items())}\n"
+        if ips.total: summary += f" [IPS]: {ips.total} apariciones | top: {self.describe_sources(ips, 3)}"
+        if not detected_threats and not ips.total: summary += " [DATA]: Sin patrones de ataque."
 
         if risk_score >= 40:
             color = COLOR_DANGER
             desc = f"PELIGRO CRÍTICO. Se detectaron firmas de ataque tipo: {', '.join(detected_threats)}. Investiga la fuente de inmediato."
+            desc += "\n\n" + "\n".join(self.describe_hits(hits) + self.describe_attackers(scan))
         elif risk_score > 0:
             color = COLOR_WARN
             desc = "Actividad sospechosa detectada en los registros. Posibles intentos de acceso o errores."
+            desc += "\n\n" + "\n".join(self.describe_hits(hits) + self.describe_attackers(scan))
         else:
             color = COLOR_SAFE
             desc = "Análisis heurístico limpio. No se encontraron patrones de ataque conocidos en este archivo."
 
         return summary, color, desc
 
+    def describe_hits(self, hits):
+        lines = []
+        for h in sorted(hits, key=lambda x: x["count"], reverse=True):
+            if not h["count"]: continue
+            lines.append(f"• {h['pattern']} ({h['threat']}): {h['count']} coincidencias, primera en offset {h['offsets'][0]}")
+        return lines
+
+    def describe_sources(self, tracker, n=TOP_SOURCES):
+        return ", ".join(f"{ip} (~{c})" for ip, c, _ in tracker.top(n))
+
+    def describe_attackers(self, scan):
+        lines = []
+        for threat in self.signatures:
+            tracker = scan.sources.get(threat)
+            if tracker and tracker.total:
+                lines.append(f"• Origen {threat}: {self.describe_sources(tracker)}")
+        if lines: lines.insert(0, "")
+        return lines
+
+
+_batch_engine = None
+
+def batch_worker(path):
+    global _batch_engine
+    if _batch_engine is None: _batch_engine = SecurityEngine()
+    r = {"path": path, "verdict": "ERROR", "severity": -1, "summary": "", "threats": {}, "hits": 0}
+    try:
+        res = _batch_engine.scan_file(path)
+        summary, color, _ = _batch_engine.report(res)
+        r["severity"] = SEVERITY.get(color, 0)
+        r["verdict"] = VERDICTS[r["severity"]]
+        r["summary"] = summary.strip()
+        if isinstance(res, GenericScan):
+            r["threats"] = _batch_engine.threat_totals(res.hits)
+            r["hits"] = res.hit_count()
+    except Exception as e:
+        r["summary"] = str(e)
+    return r
+
+def list_logs(folder):
+    paths = []
+    for root, _, files in os.walk(folder):
+        for file in files:
+            if file.endswith(LOG_EXTENSIONS): paths.append(os.path.join(root, file))
+    return paths
+
+def analyze_batch(folder="logs", workers=None, progress=None, top=10):
+    paths = list_logs(folder)
+    files = []
+    if paths:
+        workers = min(workers or os.cpu_count() or 1, len(paths))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(batch_worker, p) for p in paths]
+            for fut in as_completed(futures):
+                files.append(fut.result())
+                if progress: progress(len(files), len(paths))
+    files.sort(key=lambda x: x["path"])
+
+    totals = {}
+    verdicts = {}
+    for r in files:
+        verdicts[r["verdict"]] = verdicts.get(r["verdict"], 0) + 1
+        for t, n in r["threats"].items(): totals[t] = totals.get(t, 0) + n
+    worst = sorted((r for r in files if r["severity"] > 0), key=lambda x: (x["severity"], x["hits"]), reverse=True)[:top]
+    return {"folder": folder, "files": files, "verdicts": verdicts, "threats": totals, "worst": worst}
+
+def describe_batch(report):
+    v = report["verdicts"]
+    summary = " TIPO: ANÁLISIS POR LOTES\n"
+    summary += f" [FILES]: {len(report['files'])} | [CRIT]: {v.get('CRITICO', 0)} | [WARN]: {v.get('ALERTA', 0)}"
+    if report["threats"]: summary += f"\n [THREATS]: {', '.join(f'{t} ({n})' for t, n in report['threats'].items())}"
+
+    if v.get("CRITICO"): color = COLOR_DANGER
+    elif v.get("ALERTA"): color = COLOR_WARN
+    else: color = COLOR_SAFE
+
+    if report["worst"]:
+        desc = "Archivos con mayor riesgo:\n\n" + "\n".join(f"• [{r['verdict']}] {os.path.relpath(r['path'], report['folder'])}" + (f" ({r['hits']} firmas)" if r["hits"] else "") for r in report["worst"])
+    elif report["files"]:
+        desc = f"Revisé {len(report['files'])} archivos de {report['folder']} y ninguno presenta patrones de riesgo."
+    else:
+        desc = f"No encontré logs para analizar en {report['folder']}."
+    return summary, color, desc
+
+
+class SpaceSaving:
+    def __init__(self, capacity=HEAVY_HITTERS):
+        self.capacity = capacity
+        self.counts = {}
+        self.heap = []
+        self.total = 0
+
+    def add(self, item, n=1):
+        self.total += n
+        c = self.counts.get(item)
+        if c:
+            c[0] += n
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[item] = [n, 0]
+            heapq.heappush(self.heap, (n, item))
+            return
+        while True:
+            count, victim = self.heap[0]
+            if self.counts[victim][0] == count: break
+            heapq.heapreplace(self.heap, (self.counts[victim][0], victim))
+        del self.counts[victim]
+        self.counts[item] = [count + n, count]
+        heapq.heapreplace(self.heap, (count + n, item))
+
+    def top(self, n=TOP_SOURCES):
+        return sorted(((k, c, e) for k, (c, e) in self.counts.items()), key=lambda x: (-x[1], x[0]))[:n]
+
+    def merge(self, other):
+        for k, (c, e) in other.counts.items():
+            mine = self.counts.setdefault(k, [0, 0])
+            mine[0] += c
+            mine[1] += e
+        if len(self.counts) > self.capacity:
+            self.counts = dict(sorted(self.counts.items(), key=lambda x: x[1][0], reverse=True)[:self.capacity])
+        self.heap = [(c, k) for k, (c, _) in self.counts.items()]
+        heapq.heapify(self.heap)
+        self.total += other.total
+
+    def to_dict(self):
+        return {"capacity": self.capacity, "total": self.total, "counts": self.counts}
+
+    @classmethod
+    def from_dict(cls, d):
+        t = cls(d["capacity"])
+        t.counts = {k: list(v) for k, v in d["counts"].items()}
+        t.heap = [(c, k) for k, (c, _) in t.counts.items()]
+        heapq.heapify(t.heap)
+        t.total = d["total"]
+        return t
+
+
+class GenericScan:
+    def __init__(self, engine, binary=False):
+        self.engine = engine
+        self.hits = engine.new_hits()
+        self.sources = {ALL_SOURCES: SpaceSaving()}
+        self.tail = b"" if binary else ""
+        self.size = 0
+        self.sig_pos = 0
+        self.ip_pos = 0
+
+    def feed(self, chunk, final=False):
+        buf = self.tail + chunk
+        base = self.size - len(self.tail)
+        cut = len(buf) if final else max(len(buf) - OVERLAP, 0)
+        self.scan_window(buf, base, cut)
+        self.tail = buf[max(cut - LINE_MAX, 0):]
+        self.size += len(chunk)
+
+    def scan_window(self, buf, base, stop, endpos=None):
+        if endpos is None: endpos = len(buf)
+        self.engine.match_signatures(buf, self.hits, base, max(self.sig_pos - base, 0), stop, endpos, self.attribute)
+        self.sig_pos = max(self.sig_pos, base + stop)
+        ip_re = self.engine.ip_re if isinstance(buf, str) else self.engine.bip_re
+        tracker = self.sources[ALL_SOURCES]
+        end = max(self.ip_pos - base, 0)
+        for m in ip_re.finditer(buf, end, endpos):
+            if m.start() >= stop: break
+            ip = m.group()
+            tracker.add(ip if isinstance(ip, str) else ip.decode())
+            end = m.end()
+        self.ip_pos = max(self.ip_pos, base + end, base + stop)
+
+    def attribute(self, buf, threat, start, end):
+        if isinstance(buf, str): nl, ip_re = "\n", self.engine.ip_re
+        else: nl, ip_re = b"\n", self.engine.bip_re
+        ls = buf.rfind(nl, max(start - LINE_MAX, 0), start)
+        ls = ls + 1 if ls >= 0 else max(start - LINE_MAX, 0)
+        le = buf.find(nl, end, min(end + LINE_MAX, len(buf)))
+        if le < 0: le = min(end + LINE_MAX, len(buf))
+        ip = ip_re.search(buf, ls, le)
+        if ip:
+            ip = ip.group()
+            if threat not in self.sources: self.sources[threat] = SpaceSaving()
+            self.sources[threat].add(ip if isinstance(ip, str) else ip.decode())
+
+    def hit_count(self):
+        return sum(h["count"] for h in self.hits)
+
+    def merge(self, other):
+        for h, o in zip(self.hits, other.hits):
+            h["count"] += o["count"]
+            h["offsets"] = (h["offsets"] + o["offsets"])[:MAX_OFFSETS]
+        for threat, tracker in other.sources.items():
+            self.sources.setdefault(threat, SpaceSaving()).merge(tracker)
+        self.size = max(self.size, other.size)
+
+    def to_dict(self):
+        return {"hits": self.hits, "sources": {k: v.to_dict() for k, v in self.sources.items()}, "size": self.size}
+
+    @classmethod
+    def from_dict(cls, engine, d):
+        scan = cls(engine, binary=True)
+        if [(h["threat"], h["pattern"]) for h in d["hits"]] == engine.sig_index:
+            scan.hits = d["hits"]
+        for threat, t in d.get("sources", {}).items(): scan.sources[threat] = SpaceSaving.from_dict(t)
+        scan.size = d["size"]
+        return scan
+
+
+def load_json(path, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f: return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def save_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f: json.dump(data, f)
+    os.replace(tmp, path)
+
+
+class ResultCache:
+    def __init__(self, engine, path=RESULT_CACHE, max_bytes=CACHE_MAX_BYTES):
+        self.engine = engine
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        data = load_json(path, {})
+        self.entries = OrderedDict()
+        if data.get("signature") == engine.signature_id:
+            self.entries.update(data.get("entries", {}))
+        self.used = sum(e["bytes"] for e in self.entries.values())
+
+    def identity(self, path):
+        st = os.stat(path)
+        h = hashlib.sha1()
+        with open(path, "rb") as f:
+            h.update(f.read(FINGERPRINT_BYTES))
+            if st.st_size > 2 * FINGERPRINT_BYTES: f.seek(-FINGERPRINT_BYTES, os.SEEK_END)
+            h.update(f.read(FINGERPRINT_BYTES))
+        return [st.st_size, st.st_mtime_ns, h.hexdigest()]
+
+    def get(self, path, ident):
+        key = os.path.abspath(path)
+        with self.lock:
+            e = self.entries.get(key)
+            if e is None: return None
+            if e["id"] != ident:
+                self.drop(key)
+                return None
+            self.entries.move_to_end(key)
+            return tuple(e["result"])
+
+    def put(self, path, ident, result):
+        key = os.path.abspath(path)
+        size = len(json.dumps(result))
+        with self.lock:
+            if key in self.entries: self.drop(key)
+            self.entries[key] = {"id": ident, "result": list(result), "bytes": size}
+            self.used += size
+            while self.used > self.max_bytes and len(self.entries) > 1:
+                self.drop(next(iter(self.entries)))
+            self.save()
+
+    def drop(self, key):
+        self.used -= self.entries.pop(key)["bytes"]
+
+    def save(self):
+        save_json(self.path, {"signature": self.engine.signature_id, "entries": self.entries})
+
+
+class LogFollower:
+    def __init__(self, engine, state_path=FOLLOW_STATE):
+        self.engine = engine
+        self.state_path = state_path
+        self.state = load_json(state_path, {})
+
+    def head_hash(self, f, length):
+        f.seek(0)
+        return hashlib.sha1(f.read(min(length, HEAD_BYTES))).hexdigest()
+
+    def poll(self, path):
+        key = os.path.abspath(path)
+        new = GenericScan(self.engine, binary=True)
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            e = self.state.get(key)
+            rotated = (e is None or e["inode"] != st.st_ino or e["dev"] != st.st_dev or st.st_size < e["offset"]
+                       or (e["offset"] and self.head_hash(f, e["offset"]) != e["head"]))
+            if rotated:
+                e = {"inode": st.st_ino, "dev": st.st_dev, "offset": 0, "head": "", "totals": GenericScan(self.engine, binary=True).to_dict()}
+            total = GenericScan.from_dict(self.engine, e["totals"])
+
+            if st.st_size > e["offset"]:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    end = mm.rfind(b"\n", e["offset"], st.st_size) + 1
+                    if end <= e["offset"]: end = st.st_size if st.st_size - e["offset"] >= CHUNK_SIZE else e["offset"]
+                    if end > e["offset"]:
+                        self.engine.scan_range(mm, new, e["offset"], end)
+                        e["offset"] = end
+                        e["head"] = self.head_hash(f, end)
+                        total.merge(new)
+
+            e["size"] = st.st_size
+            e["totals"] = total.to_dict()
+            self.state[key] = e
+        save_json(self.state_path, self.state)
+        return new, total, rotated
+
+    def forget(self, path):
+        self.state.pop(os.path.abspath(path), None)
+        save_json(self.state_path, self.state)
+
+
+def tz_seconds(tz):
+    if not tz or tz == b"Z": return 0
+    tz = tz.replace(b":", b"")
+    s = int(tz[1:3]) * 3600 + int(tz[3:5]) * 60
+    return -s if tz[:1] == b"-" else s
+
+def ip_to_int(ip):
+    try: return int(ipaddress.IPv4Address(ip.decode() if isinstance(ip, bytes) else ip))
+    except ValueError: return 0
+
+def to_epoch(value):
+    if isinstance(value, str): value = datetime.datetime.fromisoformat(value)
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo: return int(value.timestamp())
+        return calendar.timegm(value.timetuple())
+    return value
+
+
+class EventStore:
+    def __init__(self, engine, source=None):
+        self.engine = engine
+        self.source = source
+        self.cols = {k: array(t) for k, t in EVENT_COLUMNS.items()}
+        self.names = {"host": [""], "prog": [""]}
+        self.ids = {"host": {"": 0}, "prog": {"": 0}}
+        self.ordered = True
+        self.offset = 0
+        self.skipped = 0
+        self.ident = None
+
+    def __len__(self):
+        return len(self.cols["ts"])
+
+    def intern(self, kind, value):
+        value = value.decode("utf-8", errors="ignore")
+        i = self.ids[kind].get(value)
+        if i is None:
+            i = self.ids[kind][value] = len(self.names[kind])
+            self.names[kind].append(value)
+        return i
+
+    def parse_line(self, line, year):
+        m = SYSLOG_RE.match(line)
+        if m:
+            mon = MONTHS.get(m.group(1))
+            if not mon: return None
+            ts = calendar.timegm((year, mon, int(m.group(2)), int(m.group(3)), int(m.group(4)), int(m.group(5))))
+            return ts, m.group(6), m.group(7), None, m.start(8)
+        m = ISO_RE.match(line)
+        if m:
+            ts = calendar.timegm(tuple(int(x) for x in m.group(1, 2, 3, 4, 5, 6))) - tz_seconds(m.group(7))
+            return ts, m.group(8), m.group(9), None, m.start(10)
+        m = WEB_RE.match(line)
+        if m:
+            mon = MONTHS.get(m.group(3))
+            if not mon: return None
+            ts = calendar.timegm((int(m.group(4)), mon, int(m.group(2)), int(m.group(5)), int(m.group(6)), int(m.group(7)))) - tz_seconds(m.group(8))
+            return ts, b"", b"http", m.group(1), m.start(9)
+        return None
+
+    def build(self, progress=None):
+        st = os.stat(self.source)
+        year = datetime.datetime.fromtimestamp(st.st_mtime).year
+        c = self.cols
+        matcher = self.engine.bmatcher
+        ip_re = self.engine.bip_re
+        with open(self.source, "rb") as f:
+            f.seek(self.offset)
+            pos = self.offset
+            for line in f:
+                if not line.endswith(b"\n"): break
+                start = pos
+                pos += len(line)
+                rec = self.parse_line(line.rstrip(b"\r\n"), year)
+                if rec is None:
+                    self.skipped += 1
+                    continue
+                ts, host, prog, ip, msg = rec
+                if ip is None:
+                    m = ip_re.search(line, msg)
+                    ip = m.group() if m else None
+                m = matcher.search(line, msg)
+                if self.ordered and c["ts"] and ts < c["ts"][-1]: self.ordered = False
+                c["ts"].append(ts)
+                c["host"].append(self.intern("host", host))
+                c["prog"].append(self.intern("prog", prog))
+                c["ip"].append(ip_to_int(ip) if ip else 0)
+                c["sig"].append(int(m.lastgroup[1:]) if m else -1)
+                c["off"].append(start + msg)
+                c["len"].append(len(line.rstrip(b"\r\n")) - msg)
+                if progress and len(c["ts"]) % 100000 == 0: progress(pos, st.st_size, self)
+            self.offset = pos
+        self.ident = [st.st_ino, st.st_size, st.st_mtime_ns]
+        return self
+
+    def query(self, start=None, end=None, ip=None, threat=None, program=None, host=None, limit=None):
+        start, end = to_epoch(start), to_epoch(end)
+        c = self.cols
+        lo, hi = 0, len(self)
+        if self.ordered:
+            if start is not None: lo = bisect.bisect_left(c["ts"], start)
+            if end is not None: hi = bisect.bisect_left(c["ts"], end)
+        if lo >= hi: return []
+
+        tests = []
+        if not self.ordered:
+            if start is not None: tests.append(("ts", lambda v: v >= start))
+            if end is not None: tests.append(("ts", lambda v: v < end))
+        if ip is not None:
+            net = ipaddress.IPv4Network(ip, strict=False)
+            base, mask = int(net.network_address), int(net.netmask)
+            tests.append(("ip", lambda v: (v & mask) == base))
+        if threat is not None:
+            sigs = [i for i, (t, _) in enumerate(self.engine.sig_index) if t == threat]
+            tests.append(("sig", lambda v: np.isin(v, sigs) if NP_OK else v in sigs))
+        for kind, value in (("prog", program), ("host", host)):
+            if value is not None:
+                i = self.ids[kind].get(value, -1)
+                tests.append((kind, lambda v, i=i: v == i))
+
+        if NP_OK:
+            mask = np.ones(hi - lo, dtype=bool)
+            for col, fn in tests:
+                mask &= fn(np.frombuffer(c[col], dtype=c[col].typecode)[lo:hi])
+            idx = (np.flatnonzero(mask) + lo).tolist()
+        else:
+            idx = [i for i in range(lo, hi) if all(fn(c[col][i]) for col, fn in tests)]
+        return idx[:limit] if limit else idx
+
+    def rows(self, idx):
+        c = self.cols
+        out = []
+        with open(self.source, "rb") as f:
+            for i in idx:
+                f.seek(c["off"][i])
+                sig = c["sig"][i]
+                out.append({
+                    "time": datetime.datetime.fromtimestamp(c["ts"][i], datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+                    "host": self.names["host"][c["host"][i]],
+                    "program": self.names["prog"][c["prog"][i]],
+                    "ip": str(ipaddress.IPv4Address(c["ip"][i])) if c["ip"][i] else "",
+                    "threat": self.engine.sig_index[sig][0] if sig >= 0 else "",
+                    "signature": self.engine.sig_index[sig][1] if sig >= 0 else "",
+                    "message": f.read(c["len"][i]).decode("utf-8", errors="ignore"),
+                })
+        return out
+
+    def save(self, folder):
+        os.makedirs(folder, exist_ok=True)
+        for k, col in self.cols.items():
+            with open(os.path.join(folder, k + ".bin"), "wb") as f: col.tofile(f)
+        save_json(os.path.join(folder, "meta.json"), {
+            "source": self.source, "ident": self.ident, "offset": self.offset, "skipped": self.skipped,
+            "ordered": self.ordered, "names": self.names, "signature": self.engine.signature_id, "rows": len(self)})
+
+    @classmethod
+    def load(cls, engine, folder):
+        meta = load_json(os.path.join(folder, "meta.json"), None)
+        if not meta or meta["signature"] != engine.signature_id: return None
+        store = cls(engine, meta["source"])
+        for k, col in store.cols.items():
+            with open(os.path.join(folder, k + ".bin"), "rb") as f: col.fromfile(f, meta["rows"])
+        store.names = meta["names"]
+        store.ids = {k: {n: i for i, n in enumerate(v)} for k, v in store.names.items()}
+        store.ordered, store.offset, store.skipped, store.ident = meta["ordered"], meta["offset"], meta["skipped"], meta["ident"]
+        return store
+
+    @classmethod
+    def open(cls, engine, path, progress=None):
+        path = os.path.abspath(path)
+        folder = os.path.join(EVENT_DIR, hashlib.sha1(path.encode()).hexdigest())
+        st = os.stat(path)
+        try: store = cls.load(engine, folder)
+        except (OSError, EOFError, KeyError, ValueError): store = None
+        if store and store.ident[:1] == [st.st_ino] and st.st_size >= store.offset:
+            if store.ident == [st.st_ino, st.st_size, st.st_mtime_ns]: return store
+        else:
+            store = cls(engine, path)
+        store.build(progress)
+        store.save(folder)
+        return store
+
 
 class MayaWindow(ctk.CTkToplevel):
-    def __init__(self, parent, archivo_pre_cargado=None):
+    def __init__(self, parent, archivo_pre_cargado=None, carpeta_pre_cargada=None):
         super().__init__(parent)
         self.title("MAYA - Security Core")
         self.geometry("550x700")
@@ -170,7 +871,10 @@ class MayaWindow(ctk.CTkToplevel):
         self.after(200, lambda: self.attributes("-topmost", False))
         
         self.engine = SecurityEngine()
-        self.is_typing = False
+        self.follower = LogFollower(self.engine)
+        self.cache = ResultCache(self.engine)
+        self.follow_path = None
+        self.follow_id = 0
         
         self.avatar_img = None
         try:
@@ -219,6 +923,12 @@ class MayaWindow(ctk.CTkToplevel):
         self.btn_file = ctk.CTkButton(self.actions_frame, text="ANALIZAR LOG", fg_color="#2596be", hover_color="#1c7aa0", height=35, command=self.ask_file)
         self.btn_file.pack(side="left", fill="x", expand=True, padx=4)
         
+        self.btn_dir = ctk.CTkButton(self.actions_frame, text="ANALIZAR CARPETA", fg_color="#2B2B2B", hover_color="#3A3A3A", height=35, border_width=1, border_color="#444", command=self.ask_folder)
+        self.btn_dir.pack(side="left", fill="x", expand=True, padx=4)
+        
+        self.btn_follow = ctk.CTkButton(self.actions_frame, text="SEGUIR LOG", fg_color="#2B2B2B", hover_color="#3A3A3A", height=35, border_width=1, border_color="#444", command=self.toggle_follow)
+        self.btn_follow.pack(side="left", fill="x", expand=True, padx=4)
+        
         self.btn_help = ctk.CTkButton(self.actions_frame, text="AYUDA", fg_color="#2B2B2B", hover_color="#3A3A3A", height=35, border_width=1, border_color="#444", command=self.open_help)
         self.btn_help.pack(side="left", fill="x", expand=True, padx=4)
 
@@ -226,6 +936,8 @@ class MayaWindow(ctk.CTkToplevel):
         
         if archivo_pre_cargado:
             self.auto_analyze(archivo_pre_cargado)
+        elif carpeta_pre_cargada:
+            self.auto_batch(carpeta_pre_cargada)
 
     def add_msg(self, text, is_user=False):
         bubble_color = COLOR_BUBBLE_USER if is_user else COLOR_BUBBLE_BOT
@@ -277,34 +989,100 @@ class MayaWindow(ctk.CTkToplevel):
         if path:
             self.auto_analyze(path)
 
+    def ask_folder(self):
+        path = filedialog.askdirectory(initialdir="logs" if os.path.isdir("logs") else None)
+        if path:
+            self.auto_batch(path)
+
+    def auto_batch(self, folder):
+        self.add_msg(f"Analizar carpeta: {folder}", is_user=True)
+        self.fake_entry.configure(placeholder_text="Buscando logs...")
+        self.btn_dir.configure(state="disabled")
+        threading.Thread(target=self.process_batch_thread, args=(folder,)).start()
+
+    def process_batch_thread(self, folder):
+        def prog(done, total):
+            self.after(0, lambda: self.set_status(f"Lote: {done}/{total} archivos"))
+        status = "Análisis finalizado."
+        try:
+            summary, color, desc = describe_batch(analyze_batch(folder, progress=prog))
+            self.after(0, lambda: self.add_report(summary, color, desc))
+        except Exception as e:
+            status = "Error en el análisis por lotes."
+            msg = f"No se pudo analizar la carpeta: {e}"
+            self.after(0, lambda: self.add_msg(msg))
+        finally:
+            self.after(0, lambda: self.set_status(status))
+            self.after(0, lambda: self.btn_dir.configure(state="normal"))
+
+    def toggle_follow(self):
+        if self.follow_path:
+            self.add_msg(f"Seguimiento detenido: {os.path.basename(self.follow_path)}", is_user=True)
+            self.follow_path = None
+            self.follow_id += 1
+            self.btn_follow.configure(text="SEGUIR LOG")
+            return
+        path = filedialog.askopenfilename(filetypes=[("Logs", "*.txt *.log *.csv *.json")])
+        if path:
+            self.follow_path = path
+            self.btn_follow.configure(text="DETENER")
+            self.add_msg(f"Siguiendo: {os.path.basename(path)}", is_user=True)
+            self.follow_id += 1
+            threading.Thread(target=self.follow_thread, args=(path, self.follow_id, True)).start()
+
+    def follow_tick(self, fid):
+        if fid == self.follow_id and self.follow_path:
+            threading.Thread(target=self.follow_thread, args=(self.follow_path, fid, False)).start()
+
+    def follow_thread(self, path, fid, first):
+        try:
+            new, total, rotated = self.follower.poll(path)
+        except Exception:
+            new, total, rotated = None, None, False
+        self.after(0, lambda: self.follow_result(fid, path, new, total, rotated, first))
+
+    def follow_result(self, fid, path, new, total, rotated, first):
+        if fid != self.follow_id: return
+        if total is None:
+            self.add_msg(f"No se pudo leer {os.path.basename(path)}.")
+        else:
+            if rotated and not first: self.add_msg("Rotación detectada. Reinicio el conteo desde el principio del archivo.")
+            self.set_status(f"Siguiendo | {total.size / (1024**2):.1f} MB | {total.hit_count()} firmas")
+            if first or new.hit_count():
+                if new.hit_count() and not first: self.add_msg(f"{new.hit_count()} firmas nuevas en {os.path.basename(path)}.")
+                summary, color, desc = self.engine.report_generic(total)
+                self.add_report(summary, color, desc)
+        self.after(FOLLOW_INTERVAL, lambda: self.follow_tick(fid))
+
     def auto_analyze(self, path):
         self.add_msg(f"Analizando: {os.path.basename(path)}", is_user=True)
         self.fake_entry.configure(placeholder_text="Identificando formato...")
-        self.is_typing = True
-        threading.Thread(target=self.typing_animation).start()
         threading.Thread(target=self.process_file_thread, args=(path,)).start()
 
-    def typing_animation(self):
-        dots = 0
-        while self.is_typing:
-            dots = (dots + 1) % 4
-            try: self.fake_entry.configure(placeholder_text="Procesando" + "." * dots)
-            except: break
-            time.sleep(0.4)
-        try: self.fake_entry.configure(placeholder_text="Análisis finalizado.")
+    def show_progress(self, done, total, scan):
+        pct = done * 100 // total if total else 100
+        text = f"Procesando {pct}% | {done / (1024**2):.1f} MB | {scan.hit_count()} firmas"
+        self.after(0, lambda: self.set_status(text))
+
+    def set_status(self, text):
+        try: self.fake_entry.configure(placeholder_text=text)
         except: pass
 
     def process_file_thread(self, path):
-        time.sleep(1.0)
+        status = "Análisis finalizado."
         try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
-        except Exception as e:
-            content = ""
-        
-        summary, color, desc = self.engine.analyze(content)
+            ident = self.cache.identity(path)
+            res = self.cache.get(path, ident)
+            if res:
+                status = "Resultado recuperado de caché."
+            else:
+                res = self.engine.analyze_file(path, progress=self.show_progress)
+                self.cache.put(path, ident, res)
+            summary, color, desc = res
+        except Exception:
+            summary, color, desc = self.engine.analyze("")
         
-        self.is_typing = False
+        self.after(0, lambda: self.set_status(status))
         self.after(0, lambda: self.add_report(summary, color, desc))
 
     def open_help(self):
@@ -312,5 +1090,24 @@ class MayaWindow(ctk.CTkToplevel):
         self.add_msg("Este módulo reconoce automáticamente los logs generados por las herramientas de KINIX y explica su contenido.")
 
 if __name__ == "__main__":
-    app = MayaWindow(None)
-    app.mainloop()
\ No newline at end of file
+    ap = argparse.ArgumentParser(description="MAYA Security Core")
+    ap.add_argument("--batch", nargs="?", const="logs", metavar="DIR")
+    ap.add_argument("--events", metavar="LOG")
+    ap.add_argument("--start")
+    ap.add_argument("--end")
+    ap.add_argument("--ip")
+    ap.add_argument("--threat")
+    ap.add_argument("--program")
+    ap.add_argument("--host")
+    ap.add_argument("--limit", type=int, default=100)
+    args = ap.parse_args()
+
+    if args.batch:
+        print(json.dumps(analyze_batch(args.batch), indent=4, ensure_ascii=False))
+    elif args.events:
+        store = EventStore.open(SecurityEngine(), args.events)
+        idx = store.query(args.start, args.end, args.ip, args.threat, args.program, args.host, args.limit)
+        for row in store.rows(idx): print(json.dumps(row, ensure_ascii=False))
+    else:
+        app = MayaWindow(None)
+        app.mainloop()
\ No newline at end of file
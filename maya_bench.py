@@ -0,0 +1,199 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import datetime
+import multiprocessing as mp
+from queue import Empty
+
+from maya import SecurityEngine, GenericScan
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+BENCH_DIR = os.path.join(".kinix", "bench")
+BLOCK_LINES = 5000
+CASE_TIMEOUT = 3600
+POLL_SECONDS = 1
+
+ATTACKS = [
+    "GET /item.php?id=1 UNION SELECT user,pass FROM users",
+    "GET /login?u=admin' OR 1=1 --",
+    "GET /search?q=<script>alert(1)</script>",
+    "GET /img?src=x onerror=alert(1)",
+    "GET /../../../../etc/passwd",
+    "Failed password for root from {ip} port 22 ssh2",
+    "pam_unix(sshd:auth): authentication failure; rhost={ip}",
+    "kernel panic - not syncing: Fatal exception",
+    "php[311]: PHP Fatal error: Allowed memory size exhausted",
+]
+NOISE = [
+    "Accepted publickey for deploy from {ip} port 51122 ssh2",
+    "GET /static/app.js HTTP/1.1 200 5123",
+    "CRON[2211]: (root) CMD (run-parts /etc/cron.hourly)",
+    "systemd[1]: Started Session 42 of user deploy.",
+    "dhclient[900]: DHCPACK of {ip} from 10.0.0.1",
+]
+PACKAGES = ["requests", "psutil", "scapy", "pillow", "openpyxl", "pypdf", "yara-python", "numpy", "spacy", "exifread"]
+VENDORS = ["Cisco Systems", "Apple, Inc.", "Intel Corporate", "TP-LINK", "Samsung Electronics", "Unknown"]
+PORTS = [(21, "ftp", "CRITICO"), (22, "ssh", "ALERTA"), (23, "telnet", "CRITICO"), (80, "http", "INFO"), (443, "https", "INFO"), (445, "microsoft-ds", "CRITICO"), (3306, "mysql", "ALERTA")]
+
+
+def rand_ip(rng):
+    return f"{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+
+def parse_size(text):
+    text = text.strip().upper()
+    mult = {"K": 1024, "M": 1024**2, "G": 1024**3}.get(text[-1:], 1)
+    return int(float(text.rstrip("KMG")) * mult)
+
+def fmt_size(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB": return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def gen_generic(rng, density):
+    ts = datetime.datetime(2026, 1, 1)
+    lines = []
+    for i in range(BLOCK_LINES):
+        ts += datetime.timedelta(seconds=rng.randint(0, 3))
+        pool = ATTACKS if rng.random() < density else NOISE
+        lines.append(f"{ts:%b %d %H:%M:%S} srv{rng.randint(1, 4)} app[{rng.randint(100, 999)}]: " + rng.choice(pool).format(ip=rand_ip(rng)))
+    return "\n".join(lines) + "\n"
+
+def gen_autopentest(rng, density):
+    lines = []
+    for i in range(BLOCK_LINES):
+        port, svc, risk = rng.choice(PORTS)
+        lines.append(f"TCP | {port} | open | {svc} | {risk}")
+    return "\n".join(lines) + "\n"
+
+def gen_patchtrack(rng, density):
+    lines = []
+    for i in range(BLOCK_LINES):
+        state = "OUTDATED" if rng.random() < density else "OK"
+        lines.append(f"{rng.choice(PACKAGES) + str(i):<30} {'1.0.' + str(i % 50):<15} {'1.1.0':<15} {state}")
+    return "\n".join(lines) + "\n"
+
+def gen_golem(rng, density):
+    lines = []
+    for i in range(BLOCK_LINES):
+        mac = ":".join(f"{rng.randint(0, 255):02x}" for _ in range(6))
+        lines.append(f"{rand_ip(rng)},{mac},{rng.choice(VENDORS)}")
+    return "\n".join(lines) + "\n"
+
+def gen_syscare(rng, density):
+    lines = []
+    for i in range(BLOCK_LINES):
+        lines.append(f"sensor_{i}: {rng.random() * 100:.2f}")
+    return "\n".join(lines) + "\n"
+
+GENERATORS = {
+    "generic": (gen_generic, ""),
+    "autopentest": (gen_autopentest, "TARGET: 192.168.1.10\n"),
+    "patchtrack": (gen_patchtrack, "REPORTE DE VERSIONES - 2026-01-01 00:00:00\n" + "-" * 60 + "\n"),
+    "golem": (gen_golem, "IP,MAC,VENDOR\n"),
+    "syscare": (gen_syscare, "=== REPORTE SYSCARE ===\nFecha: 2026-01-01 00:00:00\n\ncpu_percent: 42.0\nram_percent: 63.5\n"),
+}
+
+
+def generate(fmt, size, density=0.01, folder=BENCH_DIR, seed=1):
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"{fmt}_{size}_{density}.log")
+    if os.path.exists(path) and os.path.getsize(path) >= size: return path
+    fn, header = GENERATORS[fmt]
+    rng = random.Random(seed)
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        written += f.write(header)
+        while written < size:
+            written += f.write(fn(rng, density))
+    return path
+
+
+def peak_rss():
+    if resource:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss)
+    except Exception:
+        return 0
+
+def run_case(path, mode, queue):
+    engine = SecurityEngine()
+    base = peak_rss()
+    t0 = time.perf_counter()
+    if mode == "mmap": res = engine.scan_mmap(path)
+    elif mode == "stream": res = engine.scan_stream(path)
+    else: res = engine.scan_file(path)
+    engine.report(res)
+    elapsed = time.perf_counter() - t0
+    hits = res.hit_count() if isinstance(res, GenericScan) else 0
+    queue.put({"seconds": elapsed, "peak_rss": peak_rss(), "base_rss": base, "hits": hits})
+
+def measure(path, mode, timeout=CASE_TIMEOUT):
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    p = ctx.Process(target=run_case, args=(path, mode, queue))
+    p.start()
+    deadline = time.monotonic() + timeout
+    r = error = None
+    while r is None:
+        try: r = queue.get(timeout=POLL_SECONDS)
+        except Empty:
+            if not p.is_alive():
+                try: r = queue.get(timeout=POLL_SECONDS)
+                except Empty: break
+            elif time.monotonic() > deadline:
+                p.terminate()
+                error = f"timed out after {timeout} s"
+                break
+    p.join()
+    if r is None:
+        error = error or f"worker exited with code {p.exitcode}"
+        return {"path": path, "mode": mode, "bytes": os.path.getsize(path), "error": error}
+    with open(path, "rb") as f: lines = sum(b.count(b"\n") for b in iter(lambda: f.read(1024 * 1024), b""))
+    size = os.path.getsize(path)
+    r.update({"path": path, "mode": mode, "bytes": size, "lines": lines,
+              "mb_s": size / (1024**2) / r["seconds"] if r["seconds"] else 0,
+              "lines_s": lines / r["seconds"] if r["seconds"] else 0})
+    return r
+
+def run(formats, sizes, density=0.01, folder=BENCH_DIR, timeout=CASE_TIMEOUT):
+    results = []
+    for fmt in formats:
+        for size in sizes:
+            path = generate(fmt, size, density, folder)
+            modes = ["mmap", "stream"] if fmt == "generic" else ["auto"]
+            for mode in modes:
+                r = measure(path, mode, timeout)
+                r["format"] = fmt
+                results.append(r)
+                if "error" in r:
+                    print(f"{fmt:<12} {mode:<7} {fmt_size(r['bytes']):>9} FAILED: {r['error']}")
+                    continue
+                print(f"{fmt:<12} {mode:<7} {fmt_size(r['bytes']):>9} {r['mb_s']:>9.1f} MB/s {r['lines_s']:>12,.0f} lines/s {fmt_size(r['peak_rss']):>9} RSS {r['hits']:>10} hits")
+    return results
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="MAYA SecurityEngine benchmarks")
+    ap.add_argument("--formats", default=",".join(GENERATORS))
+    ap.add_argument("--sizes", default="1M,16M,256M")
+    ap.add_argument("--density", type=float, default=0.01)
+    ap.add_argument("--dir", default=BENCH_DIR)
+    ap.add_argument("--timeout", type=int, default=CASE_TIMEOUT)
+    ap.add_argument("--out")
+    args = ap.parse_args()
+
+    results = run(args.formats.split(","), [parse_size(s) for s in args.sizes.split(",")], args.density, args.dir, args.timeout)
+    if args.out:
+        with open(args.out, "w") as f: json.dump(results, f, indent=4)
@@ -1,11 +1,28 @@
 import customtkinter as ctk
 from tkinter import filedialog
 import os
+import sys
 import json
 import datetime
 import math
-from mimetypes import guess_type
+import hashlib
+import threading
+import argparse
+import sqlite3
+import re
+import io
+import mmap
+import gzip
+import bz2
+import lzma
+import tarfile
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from PIL import Image
+import filemagic
+from vtable import VirtualTable
 
 COLOR_FONDO = "#171718"
 COLOR_HEADER_BG = "#121213"
@@ -15,6 +32,38 @@ COLOR_SAFE = "#00E676"
 COLOR_WARN = "#FFEA00"
 COLOR_DANGER = "#FF3D00"
 
+ENT_BLOCK = 4096
+PROFILE_MAX = 2048
+HIGH_ENTROPY = 7.2
+MAX_REGIONS = 50
+READ_CHUNK = 4 * 1024 * 1024
+RULES_DIR = "rules"
+RULES_CACHE = os.path.join(".kinix", "yara")
+BULK_DIR = os.path.join("logs", "securedocs")
+STORE_DB = os.path.join(".kinix", "securedocs.db")
+QUERY_LIMIT = 5000
+PARTIAL_BYTES = 64 * 1024
+NEST_DEPTH = 3
+MEMBER_MAX = 64 * 1024 * 1024
+NEST_TOTAL = 256 * 1024 * 1024
+NEST_MEMBERS = 2000
+NEST_RATIO = 200
+NEST_RATIO_MIN = 1024 * 1024
+ZIP_TYPES = {"zip", "ooxml", "docx", "xlsx", "pptx", "vsdx", "xps", "odt", "ods", "odp", "odg", "epub", "jar", "apk"}
+STREAM_TYPES = {"gzip": gzip.GzipFile, "bzip2": bz2.BZ2File, "xz": lzma.LZMAFile}
+CONTAINERS = ZIP_TYPES | {"tar"} | set(STREAM_TYPES)
+EXTRACTABLE = {"image", "pdf", "office"}
+PROPS_MAX = 1024 * 1024
+PDF_TAIL = 4096
+PDF_WINDOW = 64 * 1024
+PDF_ESC = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+
+try:
+    import numpy as np
+    NP_OK = True
+except ImportError:
+    NP_OK = False
+
 try:
     import yara
     ENG_OK = True
@@ -23,11 +72,14 @@ except ImportError:
 
 try:
     import exifread
-    from pypdf import PdfReader
-    import docx
-    import openpyxl
 except ImportError: pass
 
+try:
+    from pypdf import PdfReader
+    PDF_OK = True
+except ImportError:
+    PDF_OK = False
+
 RULES = """
 rule Suspicious {
     strings:
@@ -39,55 +91,431 @@ rule Suspicious {
 }
 """
 
+def entropy(hist, n):
+    if not n: return 0.0
+    if NP_OK:
+        p = np.asarray(hist, dtype=np.float64)
+        p = p[p > 0] / n
+        return float(-(p * np.log2(p)).sum())
+    e = 0.0
+    for c in hist:
+        if c:
+            px = c / n
+            e -= px * math.log(px, 2)
+    return e
+
+class EntropyProfile:
+    def __init__(self, size, block=ENT_BLOCK):
+        while size > block * PROFILE_MAX: block *= 2
+        self.block = block
+        self.hist = self.new_hist()
+        self.total = 0
+        self.values = []
+        self.part = self.new_hist()
+        self.part_n = 0
+
+    def new_hist(self):
+        return np.zeros(256, dtype=np.int64) if NP_OK else [0] * 256
+
+    def update(self, data):
+        mv = memoryview(data).cast("B")
+        pos = 0
+        while pos < len(mv):
+            take = min(self.block - self.part_n, len(mv) - pos)
+            self.count(mv[pos:pos + take])
+            self.part_n += take
+            pos += take
+            if self.part_n == self.block: self.add_block()
+
+    def count(self, mv):
+        if NP_OK: self.part += np.bincount(np.frombuffer(mv, dtype=np.uint8), minlength=256)
+        else:
+            for k, c in Counter(mv).items(): self.part[k] += c
+
+    def add_block(self):
+        if NP_OK: self.hist += self.part
+        else:
+            for k, c in enumerate(self.part): self.hist[k] += c
+        self.total += self.part_n
+        self.values.append(round(entropy(self.part, self.part_n), 2))
+        self.part = self.new_hist()
+        self.part_n = 0
+
+    def finish(self):
+        if self.part_n: self.add_block()
+        return round(entropy(self.hist, self.total), 2)
+
+    def regions(self, threshold=HIGH_ENTROPY):
+        out = []
+        start = None
+        for i, v in enumerate(self.values + [0.0]):
+            if v >= threshold and start is None: start = i
+            elif v < threshold and start is not None:
+                vals = self.values[start:i]
+                out.append({"start": start * self.block, "end": min(i * self.block, self.total), "ent": round(sum(vals) / len(vals), 2)})
+                start = None
+        return out[:MAX_REGIONS]
+
+_rules = {}
+rule_errors = {}
+
+def rule_sources(folder=RULES_DIR):
+    src = {"kinix": RULES}
+    if os.path.isdir(folder):
+        for root, _, files in os.walk(folder):
+            for n in sorted(files):
+                if not n.endswith((".yar", ".yara")): continue
+                path = os.path.join(root, n)
+                try:
+                    with open(path, "r", encoding="utf-8", errors="ignore") as f: src[os.path.relpath(path, folder)] = f.read()
+                except: pass
+    return src
+
+def compile_rules(src):
+    ok, errors = {}, {}
+    for ns, code in src.items():
+        try:
+            yara.compile(source=code)
+            ok[ns] = code
+        except yara.Error as e: errors[ns] = str(e)
+    if not ok: return None, errors
+    try: return yara.compile(sources=ok), errors
+    except yara.Error as e:
+        errors.update((ns, f"conflicto al combinar: {e}") for ns in ok if ns != "kinix")
+        return yara.compile(source=src["kinix"]), errors
+
+def load_rules(folder=RULES_DIR, reload=False):
+    if not ENG_OK: return None
+    if folder in _rules and not reload: return _rules[folder]
+    src = rule_sources(folder)
+    key = hashlib.sha256(json.dumps(src, sort_keys=True).encode()).hexdigest()
+    path = os.path.join(RULES_CACHE, key + ".yarc")
+    rules, errors = None, {}
+    try:
+        rules = yara.load(path)
+        with open(path + ".json") as f: errors = json.load(f)
+    except (yara.Error, OSError, ValueError):
+        try:
+            rules, errors = compile_rules(src)
+            if rules:
+                os.makedirs(RULES_CACHE, exist_ok=True)
+                rules.save(path)
+                with open(path + ".json", "w") as f: json.dump(errors, f)
+        except: pass
+    _rules[folder] = rules
+    rule_errors[folder] = errors
+    return rules
+
+def yara_hits(rules, f, data=None):
+    try:
+        if data is None and isinstance(f, io.BytesIO): data = f.getbuffer()
+        if data is not None: matches = rules.match(data=data)
+        elif not os.fstat(f.fileno()).st_size: matches = rules.match(data=b"")
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm: matches = rules.match(data=mm)
+    except Exception: return []
+    return list(dict.fromkeys(x.rule for x in matches))
+
+def ooxml_props(p):
+    props = {}
+    with zipfile.ZipFile(p) as z:
+        names = set(z.namelist())
+        for part in ("docProps/core.xml", "docProps/app.xml"):
+            if part not in names or z.getinfo(part).file_size > PROPS_MAX: continue
+            root = ET.fromstring(z.read(part))
+            for el in root:
+                tag = el.tag.rsplit("}", 1)[-1]
+                val = (el.text or "").strip()
+                if val and len(el) == 0: props[tag[0].upper() + tag[1:]] = val
+    return props
+
+def pdf_string(data, i):
+    if data[i:i + 1] == b"<":
+        j = data.index(b">", i)
+        raw = bytes.fromhex(re.sub(rb"\s", b"", data[i + 1:j]).decode())
+        return raw, j + 1
+    out = bytearray()
+    depth = 0
+    i += 1
+    while True:
+        c = data[i:i + 1]
+        if not c: raise ValueError("unterminated string")
+        if c == b"\\":
+            n = data[i + 1:i + 2]
+            if n in PDF_ESC: out += PDF_ESC[n]
+            elif n and n in b"01234567":
+                m = re.match(rb"[0-7]{1,3}", data[i + 1:i + 4])
+                out.append(int(m.group(), 8) & 0xFF)
+                i += len(m.group()) - 1
+            elif n not in (b"\r", b"\n"): out += n
+            i += 2
+            continue
+        if c == b"(": depth += 1
+        elif c == b")":
+            if not depth: return bytes(out), i + 1
+            depth -= 1
+        out += c
+        i += 1
+
+def pdf_text(raw):
+    if raw.startswith(b"\xfe\xff"): return raw[2:].decode("utf-16-be", "ignore")
+    if raw.startswith(b"\xef\xbb\xbf"): return raw[3:].decode("utf-8", "ignore")
+    return raw.decode("latin-1")
+
+def pdf_dict(data):
+    out = {}
+    for m in re.finditer(rb"/(\w+)\s*([(<])(?!<)", data):
+        try: out[m.group(1).decode()] = pdf_text(pdf_string(data, m.start(2))[0])
+        except ValueError: pass
+    return out
+
+def pdf_xref(f, offset):
+    f.seek(offset)
+    if f.readline().strip() != b"xref": return None, None
+    entries = {}
+    while True:
+        pos = f.tell()
+        line = f.readline()
+        head = line.split()
+        if len(head) != 2 or not all(x.isdigit() for x in head):
+            f.seek(pos)
+            break
+        start, count = int(head[0]), int(head[1])
+        table = f.read(count * 20)
+        for k in range(count):
+            e = table[k * 20:k * 20 + 18].split()
+            if len(e) == 3 and e[2] == b"n": entries.setdefault(start + k, int(e[0]))
+    trailer = f.read(PDF_TAIL)
+    trailer = trailer[:trailer.find(b"startxref")] if b"startxref" in trailer else trailer
+    return entries, trailer
+
+def pdf_info(f, size):
+    f.seek(max(0, size - PDF_TAIL))
+    tail = f.read()
+    m = re.search(rb"startxref\s+(\d+)", tail[tail.rfind(b"startxref"):])
+    if not m: return None
+    offset, seen = int(m.group(1)), set()
+    entries, info = {}, None
+    while offset not in seen and offset < size:
+        seen.add(offset)
+        table, trailer = pdf_xref(f, offset)
+        if table is None: return None
+        for k, v in table.items(): entries.setdefault(k, v)
+        if info is None:
+            m = re.search(rb"/Info\s+(\d+)\s+(\d+)\s+R", trailer)
+            if m: info = int(m.group(1)), int(m.group(2))
+        m = re.search(rb"/Prev\s+(\d+)", trailer)
+        if not m: break
+        offset = int(m.group(1))
+    if info is None or info[0] not in entries: return {}
+    f.seek(entries[info[0]])
+    data = f.read(PDF_WINDOW)
+    if not re.match(rb"\s*%d\s+%d\s+obj" % info, data): return None
+    end = data.find(b"endobj")
+    return pdf_dict(data[:end] if end > 0 else data)
+
+def size_text(sz):
+    if sz < 1024: return f"{sz} B"
+    if sz < 1024**2: return f"{sz/1024:.2f} KB"
+    return f"{sz/(1024**2):.2f} MB"
+
+class MemberReader:
+    def __init__(self, f, limit):
+        self.f = f
+        self.left = limit
+        self.count = 0
+        self.truncated = False
+        self.pushback = b""
+
+    def read(self, n=-1):
+        if self.pushback:
+            data, self.pushback = self.pushback, b""
+            return data
+        if self.left <= 0:
+            if not self.truncated and self.f.read(1): self.truncated = True
+            return b""
+        data = self.f.read(self.left if n is None or n < 0 else min(n, self.left))
+        self.left -= len(data)
+        self.count += len(data)
+        return data
+
 class DocScanner:
-    def scan(self, p):
-        r = {
+    def __init__(self, store=None, depth=NEST_DEPTH, member_max=MEMBER_MAX, total_max=NEST_TOTAL):
+        self.store = store
+        self.depth = depth
+        self.member_max = member_max
+        self.total_max = total_max
+
+    def new_report(self, p):
+        return {
             "path": p, "safe": True, "hit": [], 
             "summary": {"Size": "0 KB", "Author": "N/A", "Date": "N/A", "Software": "N/A", "Location": "N/A", "Device": "N/A"},
             "raw_meta": {}, 
-            "ent": 0.0, "magic_check": True
+            "ent": 0.0, "ent_profile": {"block": ENT_BLOCK, "values": []}, "ent_regions": [], "magic_check": True, "ftype": "", "mime": "",
+            "sha256": "", "md5": "", "members": [], "nest_alerts": []
         }
+
+    def scan(self, p):
+        r = self.new_report(p)
         
         try:
             with open(p, 'rb') as f:
-                d = f.read()
-                if d:
-                    e = 0
-                    for x in range(256):
-                        px = float(d.count(bytes([x]))) / len(d)
-                        if px > 0: e += - px * math.log(px, 2)
-                    r["ent"] = round(e, 2)
-                
-                header = d[:4].hex().upper()
-                ext = os.path.splitext(p)[1].lower()
-                r["magic_check"] = self.check_magic(header, ext)
+                size = os.fstat(f.fileno()).st_size
+                prior = self.dedup(p, f, size) if self.store else None
+                if prior: return prior
+                f.seek(0)
+                self.scan_stream(f, size, p, r)
+                if self.depth > 0 and r["ftype"] in CONTAINERS:
+                    f.seek(0)
+                    self.scan_container(f, r, p, 1, {"bytes": self.total_max, "members": NEST_MEMBERS, "alerts": r["nest_alerts"]})
         except: pass
-
-        if ENG_OK:
-            try:
-                c = yara.compile(source=RULES)
-                m = c.match(p)
-                if m:
-                    r["safe"] = False
-                    r["hit"] = [x.rule for x in m]
-            except: pass
         
         self.extract_metadata(p, r)
         return r
 
-    def check_magic(self, header, ext):
-        sigs = {".jpg": "FFD8", ".jpeg": "FFD8", ".png": "89504E47", ".gif": "47494638", ".pdf": "25504446", ".exe": "4D5A", ".zip": "504B0304"}
-        if ext in sigs:
-            if not header.startswith(sigs[ext]): return False
-        return True
+    def members(self, f, ftype, name):
+        if ftype in ZIP_TYPES:
+            with zipfile.ZipFile(f) as z:
+                for info in z.infolist():
+                    if info.is_dir(): continue
+                    yield info.filename, info.file_size, info.file_size / max(info.compress_size, 1), lambda info=info: z.open(info)
+            return
+        found = False
+        try:
+            with tarfile.open(fileobj=f, mode="r:*") as tf:
+                for m in tf:
+                    found = True
+                    if m.isfile(): yield m.name, m.size, 0, lambda m=m: tf.extractfile(m)
+        except tarfile.ReadError:
+            if ftype not in STREAM_TYPES: raise
+        if found or ftype not in STREAM_TYPES: return
+        f.seek(0)
+        inner = os.path.splitext(os.path.basename(name.split("!")[-1]))[0] or "data"
+        yield inner, None, 0, lambda: STREAM_TYPES[ftype](fileobj=f) if ftype == "gzip" else STREAM_TYPES[ftype](f)
+
+    def scan_container(self, f, r, name, depth, ctx):
+        alerts = ctx["alerts"]
+        try:
+            for mname, size, ratio, opener in self.members(f, r["ftype"], name):
+                path = f"{name}!{mname}"
+                if ctx["members"] <= 0 or ctx["bytes"] <= 0: break
+                ctx["members"] -= 1
+                if ratio > NEST_RATIO and size > NEST_RATIO_MIN:
+                    alerts.append(f"{path}: ratio de compresion {ratio:.0f}:1, posible bomba de descompresion (omitido)")
+                    continue
+                try:
+                    with opener() as mf: child = self.scan_member(mf, size, path, depth, ctx)
+                except Exception as e:
+                    alerts.append(f"{path}: no se pudo leer ({e})")
+                    continue
+                r["members"].append(child)
+                for h in child["hit"]:
+                    if h not in r["hit"]: r["hit"].append(h)
+                if not child["safe"]: r["safe"] = False
+                if not child["magic_check"]: alerts.append(f"{path}: la extension no coincide con su firma ({child['raw_meta'].get('Detected Type', 'desconocido')})")
+                if child.get("truncated") and r["ftype"] not in ZIP_TYPES:
+                    alerts.append(f"{name}: analisis detenido tras un miembro truncado")
+                    break
+                if ctx["members"] <= 0 or ctx["bytes"] <= 0:
+                    alerts.append(f"{name}: limite de extraccion alcanzado, resto de miembros sin analizar")
+                    break
+        except Exception as e:
+            alerts.append(f"{name}: contenedor ilegible ({e})")
+
+    def scan_member(self, mf, size, path, depth, ctx):
+        r = self.new_report(path)
+        lim = MemberReader(mf, min(self.member_max, ctx["bytes"]))
+        first = lim.read(READ_CHUNK)
+        ft = filemagic.identify(first)
+        nested = ft is not None and ft.name in CONTAINERS and depth < self.depth
+        if nested or (ft is not None and ft.kind in EXTRACTABLE):
+            src = io.BytesIO(first + lim.read())
+            size = len(src.getbuffer())
+        else:
+            lim.pushback = first
+            src = lim
+        self.scan_stream(src, size or lim.left + len(first), path, r)
+        ctx["bytes"] -= lim.count
+        r["size"] = lim.count
+        r["summary"]["Size"] = size_text(lim.count)
+        r["ent_profile"]["values"] = []
+        if lim.truncated:
+            r["truncated"] = True
+            ctx["alerts"].append(f"{path}: truncado a {size_text(lim.count)} por limite de tamano")
+        if src is not lim:
+            self.extract(src, r)
+            if nested:
+                src.seek(0)
+                self.scan_container(src, r, path, depth + 1, ctx)
+        return r
+
+    def dedup(self, p, f, size):
+        if not self.store.has_size(size): return None
+        head = f.read(PARTIAL_BYTES)
+        ph = hashlib.sha256(head).hexdigest()
+        if not self.store.find(size, ph, None, p): return None
+        if size <= PARTIAL_BYTES: sha = ph
+        else:
+            h = hashlib.sha256(head)
+            for chunk in iter(lambda: f.read(READ_CHUNK), b""): h.update(chunk)
+            sha = h.hexdigest()
+        prior = self.store.find(size, ph, sha, p)
+        if not prior: return None
+        r = self.store.report(prior["path"])
+        if not r: return None
+        r["path"], r["dup_of"] = p, prior["path"]
+        r["magic_check"] = filemagic.index().matches(filemagic.index().types.get(r.get("ftype")), os.path.splitext(p)[1])
+        st = os.fstat(f.fileno())
+        r["raw_meta"]["System Modified"] = str(datetime.datetime.fromtimestamp(st.st_mtime))
+        r["raw_meta"]["System Created"] = str(datetime.datetime.fromtimestamp(st.st_ctime))
+        return r
+
+    def scan_stream(self, f, size, name, r):
+        rules = load_rules()
+        prof = EntropyProfile(size)
+        sha, md5 = hashlib.sha256(), hashlib.md5()
+        seekable = isinstance(f, (io.BufferedReader, io.BytesIO))
+        keep = bytearray() if rules and not seekable else None
+        head = None
+        while True:
+            chunk = f.read(READ_CHUNK)
+            if not chunk: break
+            if head is None:
+                head = chunk[:filemagic.HEAD_BYTES]
+                r["phash"] = hashlib.sha256(chunk[:PARTIAL_BYTES]).hexdigest()
+                self.identify(head, name, r, f if seekable else None)
+            sha.update(chunk)
+            md5.update(chunk)
+            prof.update(chunk)
+            if keep is not None: keep += chunk
+        hits = yara_hits(rules, f, keep) if rules else []
+        if rule_errors.get(RULES_DIR): r["raw_meta"]["YARA Packs Omitted"] = ", ".join(rule_errors[RULES_DIR])
+
+        r["ent"] = prof.finish()
+        r["ent_profile"] = {"block": prof.block, "values": prof.values}
+        r["ent_regions"] = prof.regions()
+        r["sha256"] = sha.hexdigest()
+        r["md5"] = md5.hexdigest()
+        r["size"] = size
+        r["raw_meta"]["SHA-256"] = r["sha256"]
+        r["raw_meta"]["MD5"] = r["md5"]
+        if hits:
+            r["safe"] = False
+            r["hit"] = hits
+        return r
+
+    def identify(self, head, name, r, f=None):
+        ft = filemagic.identify(head, f)
+        r["magic_check"] = filemagic.index().matches(ft, os.path.splitext(name)[1])
+        if ft:
+            r["ftype"], r["mime"] = ft.name, ft.mime
+            r["raw_meta"]["Detected Type"] = f"{ft.desc} ({ft.mime})"
+        return ft
 
     def extract_metadata(self, p, r):
         try:
             s = os.stat(p)
-            sz = s.st_size
-            if sz < 1024: r["summary"]["Size"] = f"{sz} B"
-            elif sz < 1024**2: r["summary"]["Size"] = f"{sz/1024:.2f} KB"
-            else: r["summary"]["Size"] = f"{sz/(1024**2):.2f} MB"
+            r["summary"]["Size"] = size_text(s.st_size)
             
             dt = datetime.datetime.fromtimestamp(s.st_mtime)
             r["summary"]["Date"] = dt.strftime("%Y-%m-%d %H:%M")
@@ -95,70 +523,254 @@ class DocScanner:
             r["raw_meta"]["System Created"] = str(datetime.datetime.fromtimestamp(s.st_ctime))
         except: pass
 
-        mt, _ = guess_type(p)
-        if mt:
-            if "image" in mt: self._img(p, r)
-            elif "pdf" in mt: self._pdf(p, r)
-            elif "word" in mt or "sheet" in mt: self._office(p, r)
+        if r["ftype"]:
+            try:
+                with open(p, "rb") as f: self.extract(f, r)
+            except OSError: pass
+
+    def extract(self, f, r):
+        kind = filemagic.index().types[r["ftype"]].kind if r["ftype"] else None
+        if kind in EXTRACTABLE: f.seek(0)
+        if kind == "image": self._img(f, r)
+        elif kind == "pdf": self._pdf(f, r)
+        elif kind == "office": self._office(f, r)
 
-    def _img(self, p, r):
+    def _img(self, f, r):
         try:
-            with open(p, 'rb') as f:
-                tags = exifread.process_file(f, details=True)
-                for k, v in tags.items():
-                    if k == "JPEGThumbnail": continue
-                    r["raw_meta"][k] = str(v)
-                    
-                    k_lo = k.lower()
-                    val = str(v)
-                    if "image artist" in k_lo or "xpauthor" in k_lo: r["summary"]["Author"] = val
-                    if "software" in k_lo: r["summary"]["Software"] = val
-                    if "model" in k_lo: r["summary"]["Device"] = val
-                    if "datetime" in k_lo and "original" in k_lo: r["summary"]["Date"] = val
-                    
-                    if "gps latitude" in k_lo:
-                        r["summary"]["Location"] = "Datos GPS Detectados"
+            tags = exifread.process_file(f, details=True)
+            for k, v in tags.items():
+                if k == "JPEGThumbnail": continue
+                r["raw_meta"][k] = str(v)
+                
+                k_lo = k.lower()
+                val = str(v)
+                if "image artist" in k_lo or "xpauthor" in k_lo: r["summary"]["Author"] = val
+                if "software" in k_lo: r["summary"]["Software"] = val
+                if "model" in k_lo: r["summary"]["Device"] = val
+                if "datetime" in k_lo and "original" in k_lo: r["summary"]["Date"] = val
+                
+                if "gps latitude" in k_lo:
+                    r["summary"]["Location"] = "Datos GPS Detectados"
         except: pass
 
-    def _pdf(self, p, r):
+    def _pdf(self, f, r):
         try:
-            pdf = PdfReader(p)
-            meta = pdf.metadata
-            if meta:
-                for k, v in meta.items():
-                    key_clean = k.replace("/", "")
-                    r["raw_meta"][key_clean] = str(v)
-                    
-                    if "Author" in key_clean: r["summary"]["Author"] = str(v)
-                    if "Creator" in key_clean or "Producer" in key_clean: r["summary"]["Software"] = str(v)
-                    if "CreationDate" in key_clean: r["summary"]["Date"] = str(v).replace("D:", "").split('+')[0]
+            meta = pdf_info(f, f.seek(0, 2))
+            if meta is None and PDF_OK:
+                f.seek(0)
+                meta = {k.replace("/", ""): str(v) for k, v in (PdfReader(f).metadata or {}).items()}
+            for key_clean, v in (meta or {}).items():
+                r["raw_meta"][key_clean] = str(v)
+
+                if "Author" in key_clean: r["summary"]["Author"] = str(v)
+                if "Creator" in key_clean or "Producer" in key_clean: r["summary"]["Software"] = str(v)
+                if "CreationDate" in key_clean: r["summary"]["Date"] = str(v).replace("D:", "").split('+')[0]
         except: pass
 
-    def _office(self, p, r):
+    def _office(self, f, r):
         try:
-            if p.endswith(".docx"):
-                doc = docx.Document(p)
-                cp = doc.core_properties
-                r["summary"]["Author"] = cp.author or "N/A"
-                r["summary"]["Date"] = str(cp.modified) or str(cp.created)
-                r["summary"]["Software"] = "Microsoft Word / OpenXML"
-                attrs = ["author", "category", "comments", "content_status", "created", "identifier", "keywords", "language", "last_modified_by", "modified", "revision", "subject", "title", "version"]
-                for a in attrs:
-                    val = getattr(cp, a, None)
-                    if val: r["raw_meta"][a.capitalize()] = str(val)
-
-            elif p.endswith(".xlsx"):
-                wb = openpyxl.load_workbook(p)
-                cp = wb.properties
-                r["summary"]["Author"] = cp.creator or "N/A"
-                r["summary"]["Date"] = str(cp.modified) or str(cp.created)
-                r["summary"]["Software"] = "Microsoft Excel / OpenXML"
-                attrs = ["creator", "title", "description", "subject", "identifier", "language", "created", "modified", "lastModifiedBy", "category", "contentStatus", "version", "revision"]
-                for a in attrs:
-                    val = getattr(cp, a, None)
-                    if val: r["raw_meta"][a.capitalize()] = str(val)
+            cp = ooxml_props(f)
+            app = {"docx": "Microsoft Word", "xlsx": "Microsoft Excel", "pptx": "Microsoft PowerPoint", "vsdx": "Microsoft Visio"}.get(r["ftype"], "Office")
+            r["summary"]["Author"] = cp.get("Creator", "N/A")
+            r["summary"]["Date"] = cp.get("Modified") or cp.get("Created") or r["summary"]["Date"]
+            r["summary"]["Software"] = " ".join(filter(None, [cp.get("Application"), cp.get("AppVersion")])) or app + " / OpenXML"
+            r["raw_meta"].update(cp)
         except: pass
 
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    sha256 TEXT,
+    md5 TEXT,
+    size INTEGER,
+    ftype TEXT,
+    author TEXT COLLATE NOCASE,
+    software TEXT COLLATE NOCASE,
+    device TEXT COLLATE NOCASE,
+    date TEXT,
+    gps INTEGER,
+    safe INTEGER,
+    magic_ok INTEGER,
+    ent REAL,
+    scanned REAL,
+    report TEXT,
+    phash TEXT,
+    dup_of INTEGER
+);
+CREATE TABLE IF NOT EXISTS hits (file_id INTEGER NOT NULL, rule TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS files_sha256 ON files(sha256);
+CREATE INDEX IF NOT EXISTS files_author ON files(author);
+CREATE INDEX IF NOT EXISTS files_software ON files(software);
+CREATE INDEX IF NOT EXISTS files_device ON files(device);
+CREATE INDEX IF NOT EXISTS files_gps ON files(gps, device);
+CREATE INDEX IF NOT EXISTS files_ftype ON files(ftype);
+CREATE INDEX IF NOT EXISTS hits_rule ON hits(rule, file_id);
+CREATE INDEX IF NOT EXISTS hits_file ON hits(file_id);
+"""
+SCHEMA_DEDUP = """
+CREATE INDEX IF NOT EXISTS files_content ON files(size, phash, sha256);
+CREATE INDEX IF NOT EXISTS files_dup ON files(dup_of);
+"""
+
+def na(v):
+    return None if v in (None, "", "N/A") else str(v)
+
+def like(v):
+    return v.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_").replace("*", "%")
+
+class ResultStore:
+    def __init__(self, path=STORE_DB, readonly=False):
+        if readonly:
+            self.db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            self.db.row_factory = sqlite3.Row
+            return
+        if os.path.dirname(path): os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        cols = {x[1] for x in self.db.execute("PRAGMA table_info(files)")}
+        for col, kind in (("phash", "TEXT"), ("dup_of", "INTEGER")):
+            if col not in cols: self.db.execute(f"ALTER TABLE files ADD COLUMN {col} {kind}")
+        self.db.executescript(SCHEMA_DEDUP)
+
+    def add(self, r, commit=True):
+        if not r.get("sha256"): return None
+        s = r["summary"]
+        dup = self.db.execute("SELECT id FROM files WHERE path = ?", (r["dup_of"],)).fetchone() if r.get("dup_of") else None
+        vals = (r.get("sha256"), r.get("md5"), r.get("size"), r.get("ftype") or None, na(s.get("Author")), na(s.get("Software")),
+                na(s.get("Device")), na(s.get("Date")), int(na(s.get("Location")) is not None), int(bool(r["safe"])),
+                int(bool(r["magic_check"])), r.get("ent"), datetime.datetime.now().timestamp(),
+                None if dup else json.dumps(r, default=str), r.get("phash"), dup[0] if dup else None)
+        row = self.db.execute("SELECT id, sha256 FROM files WHERE path = ?", (r["path"],)).fetchone()
+        if row:
+            fid = row[0]
+            if row[1] != r["sha256"]:
+                self.db.execute("UPDATE files SET report = (SELECT report FROM files WHERE id = ?), dup_of = NULL WHERE dup_of = ?", (fid, fid))
+            self.db.execute("UPDATE files SET sha256=?, md5=?, size=?, ftype=?, author=?, software=?, device=?, date=?, gps=?, safe=?, magic_ok=?, ent=?, scanned=?, report=?, phash=?, dup_of=? WHERE id=?", vals + (fid,))
+            self.db.execute("DELETE FROM hits WHERE file_id = ?", (fid,))
+        else:
+            fid = self.db.execute("INSERT INTO files(sha256, md5, size, ftype, author, software, device, date, gps, safe, magic_ok, ent, scanned, report, phash, dup_of, path) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)", vals + (r["path"],)).lastrowid
+        self.db.executemany("INSERT INTO hits(file_id, rule) VALUES (?, ?)", [(fid, h) for h in r.get("hit", [])])
+        if commit: self.db.commit()
+        return fid
+
+    def commit(self):
+        self.db.commit()
+
+    def query(self, author=None, software=None, device=None, sha256=None, hit=None, gps=None, ftype=None, limit=QUERY_LIMIT):
+        where, args = [], []
+        for col, val in (("author", author), ("software", software), ("device", device), ("ftype", ftype), ("sha256", sha256 and sha256.lower())):
+            if not val: continue
+            if "*" in val:
+                where.append(f"{col} LIKE ? ESCAPE '\\'")
+                args.append(like(val))
+            else:
+                where.append(f"{col} = ?")
+                args.append(val)
+        if gps is not None:
+            where.append("gps = ?")
+            args.append(int(gps))
+        if hit:
+            where.append("id IN (SELECT file_id FROM hits WHERE rule = ?)")
+            args.append(hit)
+        sql = "SELECT id, path, sha256, ftype, author, software, device, date, gps, safe, magic_ok FROM files"
+        if where: sql += " WHERE " + " AND ".join(where)
+        rows = self.db.execute(sql + " ORDER BY id DESC LIMIT ?", args + [limit]).fetchall()
+        return [dict(x) for x in rows]
+
+    def has_size(self, size):
+        return self.db.execute("SELECT 1 FROM files WHERE size = ? LIMIT 1", (size,)).fetchone() is not None
+
+    def find(self, size, phash, sha256=None, path=None):
+        sql = "SELECT id, path FROM files WHERE size = ? AND phash = ? AND dup_of IS NULL AND path != ?"
+        args = [size, phash, path or ""]
+        if sha256:
+            sql += " AND sha256 = ?"
+            args.append(sha256)
+        return self.db.execute(sql + " LIMIT 1", args).fetchone()
+
+    def report(self, path):
+        row = self.db.execute("SELECT f.report, o.report, o.path FROM files f LEFT JOIN files o ON o.id = f.dup_of WHERE f.path = ?", (path,)).fetchone()
+        if not row or not (row[0] or row[1]): return None
+        r = json.loads(row[0] or row[1])
+        r["path"] = path
+        if row[2]: r["dup_of"] = row[2]
+        return r
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+_bulk_scanner = None
+
+def bulk_worker(p, store=None, depth=NEST_DEPTH):
+    global _bulk_scanner
+    if _bulk_scanner is None:
+        try: db = ResultStore(store, readonly=True) if store else None
+        except sqlite3.Error: db = None
+        _bulk_scanner = DocScanner(db, depth)
+    try: return _bulk_scanner.scan(p)
+    except Exception as e: return {"path": p, "error": str(e)}
+
+def bulk_done(out):
+    done = set()
+    if not os.path.exists(out): return done
+    valid = 0
+    with open(out, "rb") as f:
+        for line in f:
+            try: done.add(json.loads(line)["path"])
+            except (ValueError, KeyError): break
+            valid += len(line)
+    if valid < os.path.getsize(out):
+        with open(out, "r+b") as f: f.truncate(valid)
+    return done
+
+def bulk_paths(folder, done):
+    for root, _, files in os.walk(folder):
+        for n in files:
+            p = os.path.abspath(os.path.join(root, n))
+            if p not in done and os.path.isfile(p): yield p
+
+def bulk_output(folder):
+    folder = os.path.abspath(folder)
+    tag = hashlib.sha1(folder.encode()).hexdigest()[:8]
+    return os.path.join(BULK_DIR, f"bulk_{os.path.basename(folder) or 'root'}_{tag}.jsonl")
+
+def bulk_scan(folder, out=None, workers=None, progress=None, store=STORE_DB, depth=NEST_DEPTH):
+    out = out or bulk_output(folder)
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    done = bulk_done(out)
+    skipped = len(done)
+    count = 0
+    workers = workers or os.cpu_count() or 1
+    paths = bulk_paths(folder, done)
+    db = ResultStore(store) if store else None
+    with ProcessPoolExecutor(max_workers=workers) as pool, open(out, "a", encoding="utf-8") as f:
+        pending = set()
+        while True:
+            for p in paths:
+                pending.add(pool.submit(bulk_worker, p, store, depth))
+                if len(pending) >= workers * 4: break
+            if not pending: break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                r = fut.result()
+                f.write(json.dumps(r, default=str) + "\n")
+                if db: db.add(r, commit=False)
+                count += 1
+            f.flush()
+            if db: db.commit()
+            if progress: progress(count, skipped)
+    if db:
+        db.commit()
+        db.close()
+    return out, count, skipped
+
 class MetaCard(ctk.CTkFrame):
     def __init__(self, parent, icon_text, title, value, color=COLOR_ACENTO):
         super().__init__(parent, fg_color=COLOR_TARJETA, corner_radius=8, border_width=1, border_color="#2B2B2B")
@@ -188,8 +800,11 @@ class SecureDocsWindow(ctk.CTkToplevel):
 
         try: self.iconphoto(False, ctk.tkinter.PhotoImage(file="resc/vn.png"))
         except: pass
-        self.eng = DocScanner()
+        try: self.store = ResultStore()
+        except sqlite3.Error: self.store = None
+        self.eng = DocScanner(self.store)
         self.cache = None
+        self.q_rows = []
         
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(1, weight=1)
@@ -217,6 +832,10 @@ class SecureDocsWindow(ctk.CTkToplevel):
         self.btn.pack(side="left", padx=20, pady=15)
         self.btn_s = ctk.CTkButton(self.ft, text="EXPORTAR JSON", fg_color="#2B2B2B", width=140, command=self.save)
         self.btn_s.pack(side="right", padx=20, pady=15)
+        self.btn_b = ctk.CTkButton(self.ft, text="ESCANEO MASIVO", fg_color="#2B2B2B", width=140, command=self.sel_bulk)
+        self.btn_b.pack(side="right", padx=(20, 0), pady=15)
+        self.btn_q = ctk.CTkButton(self.ft, text="BUSCAR", fg_color="#2B2B2B", width=100, command=self.search_view)
+        self.btn_q.pack(side="right", padx=(20, 0), pady=15)
 
     def empty_state(self):
         self.lbl_empty = ctk.CTkLabel(self.scr, text="📂\nArrastre un archivo o haga clic en Seleccionar\npara extraer metadatos forenses.", font=("Roboto", 14), text_color="gray")
@@ -227,12 +846,40 @@ class SecureDocsWindow(ctk.CTkToplevel):
         self.lift()
         if p: self.run(p)
 
-    def run(self, p):
+    def sel_bulk(self):
+        d = filedialog.askdirectory()
+        self.lift()
+        if d:
+            self.btn_b.configure(state="disabled", text="ESCANEANDO...")
+            threading.Thread(target=self.run_bulk, args=(d,)).start()
+
+    def run_bulk(self, d):
+        def prog(n, skipped):
+            self.after(0, lambda: self.btn_b.configure(text=f"{n + skipped} ARCHIVOS"))
+        try:
+            out, n, skipped = bulk_scan(d, progress=prog)
+            msg = f"Escaneo masivo completado: {n} archivos nuevos, {skipped} ya procesados.\nResultados en {out}"
+        except Exception as e:
+            msg = f"Error en escaneo masivo: {e}"
+        self.after(0, lambda: self.bulk_finished(msg))
+
+    def bulk_finished(self, msg):
+        self.btn_b.configure(state="normal", text="ESCANEO MASIVO")
         for w in self.scr.winfo_children(): w.destroy()
+        ctk.CTkLabel(self.scr, text=msg, font=("Roboto", 13), text_color="gray", justify="left").pack(pady=60)
+
+    def run(self, p):
         r = self.eng.scan(p)
+        if self.store:
+            try: self.store.add(r)
+            except sqlite3.Error: pass
+        self.show(r)
+
+    def show(self, r):
+        for w in self.scr.winfo_children(): w.destroy()
         self.cache = r
-        
-        self.draw_status_header(r, p)
+
+        self.draw_status_header(r, r["path"])
 
         ctk.CTkLabel(self.scr, text="RESUMEN CLAVE", font=("Roboto", 11, "bold"), text_color="gray").pack(anchor="w", pady=(15, 5))
         self.draw_dashboard(r["summary"])
@@ -240,6 +887,21 @@ class SecureDocsWindow(ctk.CTkToplevel):
         ctk.CTkLabel(self.scr, text=f"METADATOS RAW ({len(r['raw_meta'])})", font=("Roboto", 11, "bold"), text_color="gray").pack(anchor="w", pady=(20, 5))
         self.draw_raw_list(r["raw_meta"])
 
+        if r.get("members"):
+            ctk.CTkLabel(self.scr, text=f"CONTENIDO ({len(r['members'])} miembros)", font=("Roboto", 11, "bold"), text_color="gray").pack(anchor="w", pady=(20, 5))
+            self.draw_members(r["members"])
+
+    def draw_members(self, members):
+        tbl = VirtualTable(self.scr, [
+            {"title": "MIEMBRO", "max": 50, "font": ("Consolas", 10), "color": COLOR_ACENTO},
+            {"title": "TIPO", "width": 60},
+            {"title": "TAMANO", "width": 80},
+            {"title": "ENTROPIA", "width": 70},
+            {"title": "YARA", "width": 120, "max": 18},
+        ], on_select=lambda i: self.show(members[i]), fg_color=COLOR_TARJETA)
+        tbl.pack(fill="x")
+        tbl.set_rows((m["path"].split("!", 1)[-1], m["ftype"], m["size"], m["ent"], ", ".join(m["hit"])) for m in members)
+
     def draw_status_header(self, r, path):
         is_safe = r["safe"] and r["magic_check"]
         c = COLOR_SAFE if is_safe else COLOR_DANGER
@@ -254,11 +916,26 @@ class SecureDocsWindow(ctk.CTkToplevel):
         ctk.CTkLabel(top, text=f"Entropia: {r['ent']}", font=("Consolas", 11, "bold"), text_color="white").pack(side="right")
         
         ctk.CTkLabel(status_fr, text=os.path.basename(path), text_color="white", font=("Roboto", 11)).pack(padx=10, pady=(0, 8), anchor="w")
+        if r.get("dup_of"):
+            ctk.CTkLabel(status_fr, text=f"Contenido identico a {r['dup_of']} (resultado reutilizado)", text_color="white", font=("Roboto", 10), wraplength=700, justify="left").pack(padx=10, pady=(0, 8), anchor="w")
+
+        if r.get("ent_regions"):
+            reg = ", ".join(f"0x{x['start']:X}-0x{x['end']:X} ({x['ent']})" for x in r["ent_regions"][:3])
+            ent_fr = ctk.CTkFrame(self.scr, fg_color="#2B2B2B", border_color=COLOR_WARN, border_width=1)
+            ent_fr.pack(fill="x", pady=5)
+            ctk.CTkLabel(ent_fr, text=f"⚠️ {len(r['ent_regions'])} REGIONES DE ALTA ENTROPIA (cifrado/empaquetado): {reg}", text_color=COLOR_WARN, wraplength=700, justify="left").pack(pady=5, padx=10)
+
+        if r.get("nest_alerts"):
+            nest_fr = ctk.CTkFrame(self.scr, fg_color="#2B2B2B", border_color=COLOR_WARN, border_width=1)
+            nest_fr.pack(fill="x", pady=5)
+            more = f"\n... y {len(r['nest_alerts']) - 5} mas" if len(r["nest_alerts"]) > 5 else ""
+            ctk.CTkLabel(nest_fr, text="⚠️ CONTENEDOR:\n" + "\n".join(r["nest_alerts"][:5]) + more, text_color=COLOR_WARN, wraplength=700, justify="left").pack(pady=5, padx=10, anchor="w")
 
         if not r["magic_check"]:
             err_fr = ctk.CTkFrame(self.scr, fg_color="#2B2B2B", border_color=COLOR_WARN, border_width=1)
             err_fr.pack(fill="x", pady=5)
-            ctk.CTkLabel(err_fr, text="⚠️ ALERTA DE MAGIC BYTES: La extension no coincide con su firma.", text_color=COLOR_WARN).pack(pady=5)
+            real = r["raw_meta"].get("Detected Type", "desconocido")
+            ctk.CTkLabel(err_fr, text=f"⚠️ ALERTA DE MAGIC BYTES: La extension no coincide con su firma (contenido real: {real}).", text_color=COLOR_WARN, wraplength=700).pack(pady=5)
 
     def draw_dashboard(self, s):
         grid = ctk.CTkFrame(self.scr, fg_color="transparent")
@@ -281,18 +958,59 @@ class SecureDocsWindow(ctk.CTkToplevel):
             ctk.CTkLabel(list_fr, text="No se encontraron metadatos adicionales.", text_color="gray").pack(pady=15)
             return
 
-        i = 0
-        for k, v in raw.items():
-            bg = "#252526" if i % 2 == 0 else "transparent"
-            row = ctk.CTkFrame(list_fr, fg_color=bg, corner_radius=0)
-            row.pack(fill="x")
-            
-            k_txt = (k[:30] + '..') if len(k) > 30 else k
-            ctk.CTkLabel(row, text=k_txt, width=180, anchor="w", font=("Consolas", 10), text_color=COLOR_ACENTO).pack(side="left", padx=8, pady=2)
-            
-            v_txt = (v[:80] + '...') if len(v) > 80 else v
-            ctk.CTkLabel(row, text=v_txt, anchor="w", font=("Roboto", 10), text_color="#DDD").pack(side="left", padx=8, pady=2)
-            i += 1
+        tbl = VirtualTable(list_fr, [
+            {"title": "CLAVE", "width": 180, "max": 30, "font": ("Consolas", 10), "color": COLOR_ACENTO},
+            {"title": "VALOR", "max": 80},
+        ], fg_color="transparent")
+        tbl.pack(fill="x", padx=4, pady=4)
+        tbl.set_rows(raw.items())
+
+    def search_view(self):
+        for w in self.scr.winfo_children(): w.destroy()
+        if not self.store:
+            ctk.CTkLabel(self.scr, text=f"No se pudo abrir la base de resultados ({STORE_DB}).", text_color="gray").pack(pady=60)
+            return
+        ctk.CTkLabel(self.scr, text=f"BUSCAR EN RESULTADOS ({self.store.count()} archivos)", font=("Roboto", 11, "bold"), text_color="gray").pack(anchor="w", pady=(15, 5))
+
+        form = ctk.CTkFrame(self.scr, fg_color=COLOR_TARJETA)
+        form.pack(fill="x")
+        form.grid_columnconfigure((1, 3), weight=1)
+        self.q = {}
+        fields = [("author", "Autor"), ("software", "Software"), ("device", "Dispositivo"), ("hit", "Regla YARA"), ("ftype", "Tipo"), ("sha256", "SHA-256")]
+        for i, (k, label) in enumerate(fields):
+            ctk.CTkLabel(form, text=label, font=("Roboto", 10), text_color="gray").grid(row=i // 2, column=i % 2 * 2, sticky="w", padx=8, pady=4)
+            e = ctk.CTkEntry(form, height=26, placeholder_text="valor exacto o prefijo*")
+            e.grid(row=i // 2, column=i % 2 * 2 + 1, sticky="ew", padx=8, pady=4)
+            e.bind("<Return>", lambda ev: self.do_search())
+            self.q[k] = e
+        self.q_gps = ctk.CTkCheckBox(form, text="Solo con GPS", font=("Roboto", 10))
+        self.q_gps.grid(row=3, column=0, columnspan=2, sticky="w", padx=8, pady=6)
+        ctk.CTkButton(form, text="BUSCAR", fg_color=COLOR_ACENTO, width=120, command=self.do_search).grid(row=3, column=3, sticky="e", padx=8, pady=6)
+
+        self.q_lbl = ctk.CTkLabel(self.scr, text="", font=("Roboto", 11, "bold"), text_color="gray")
+        self.q_lbl.pack(anchor="w", pady=(15, 5))
+        self.q_tbl = VirtualTable(self.scr, [
+            {"title": "ARCHIVO", "max": 40, "color": COLOR_ACENTO},
+            {"title": "TIPO", "width": 60},
+            {"title": "AUTOR", "width": 120, "max": 18},
+            {"title": "SOFTWARE", "width": 140, "max": 22},
+            {"title": "DISPOSITIVO", "width": 120, "max": 18},
+            {"title": "GPS", "width": 40},
+        ], filter_box=False, on_select=self.open_result, fg_color=COLOR_TARJETA)
+        self.q_tbl.pack(fill="x")
+        self.do_search()
+
+    def do_search(self):
+        args = {k: e.get().strip() or None for k, e in self.q.items()}
+        if self.q_gps.get(): args["gps"] = True
+        self.q_rows = self.store.query(**args)
+        more = " (limite alcanzado)" if len(self.q_rows) >= QUERY_LIMIT else ""
+        self.q_lbl.configure(text=f"RESULTADOS ({len(self.q_rows)}){more} - clic para abrir")
+        self.q_tbl.set_rows((os.path.basename(x["path"]), x["ftype"] or "", x["author"] or "N/A", x["software"] or "N/A", x["device"] or "N/A", "SI" if x["gps"] else "") for x in self.q_rows)
+
+    def open_result(self, i):
+        r = self.store.report(self.q_rows[i]["path"])
+        if r: self.show(r)
 
     def save(self):
         if not self.cache: return
@@ -301,4 +1019,27 @@ class SecureDocsWindow(ctk.CTkToplevel):
         n = f"forensic_report_{datetime.datetime.now().strftime('%d%m%Y_%H%M%S')}.json"
         with open(os.path.join(d, n), "w") as f: json.dump(self.cache, f, indent=4, default=str)
         self.btn_s.configure(text="EXPORTADO OK", fg_color="#00E676")
-        self.after(2000, lambda: self.btn_s.configure(text="EXPORTAR JSON", fg_color="#2B2B2B"))
\ No newline at end of file
+        self.after(2000, lambda: self.btn_s.configure(text="EXPORTAR JSON", fg_color="#2B2B2B"))
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="SecureDocs forensic scanner")
+    ap.add_argument("--bulk", metavar="DIR")
+    ap.add_argument("--out")
+    ap.add_argument("--workers", type=int)
+    ap.add_argument("--depth", type=int, default=NEST_DEPTH, help="niveles de contenedores a recorrer (0 = ninguno)")
+    ap.add_argument("--find", action="store_true", help="consultar la base de resultados")
+    for k in ("author", "software", "device", "sha256", "hit", "ftype"): ap.add_argument("--" + k)
+    ap.add_argument("--gps", action="store_true")
+    ap.add_argument("--limit", type=int, default=QUERY_LIMIT)
+    args = ap.parse_args()
+    if args.bulk:
+        load_rules()
+        for ns, err in rule_errors.get(RULES_DIR, {}).items(): print(f"Paquete YARA omitido {ns}: {err}", file=sys.stderr)
+        out, n, skipped = bulk_scan(args.bulk, args.out, args.workers, lambda n, sk: print(f"\r{n + sk} archivos", end="", flush=True), depth=args.depth)
+        print(f"\n{n} nuevos, {skipped} omitidos -> {out}")
+    elif args.find:
+        rows = ResultStore().query(args.author, args.software, args.device, args.sha256, args.hit, True if args.gps else None, args.ftype, args.limit)
+        for x in rows: print("\t".join(str(x[k] or "") for k in ("path", "ftype", "author", "software", "device", "sha256")))
+        print(f"{len(rows)} resultados", file=sys.stderr)
+    else:
+        ap.error("indique --bulk DIR o --find")
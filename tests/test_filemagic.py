@@ -0,0 +1,46 @@
+import io
+import os
+import sys
+import zipfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import filemagic
+
+
+def make_zip(members, comp=zipfile.ZIP_DEFLATED):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", comp) as z:
+        for name, data in members: z.writestr(name, data)
+    return buf
+
+
+def kind(buf):
+    head = buf.getvalue()[:filemagic.HEAD_BYTES]
+    return filemagic.identify(head).name, filemagic.identify(head, buf).name
+
+
+class ZipKindTest(unittest.TestCase):
+    def test_plain_zip_with_manifest_members(self):
+        for member in ("META-INF/MANIFEST.MF", "AndroidManifest.xml"):
+            buf = make_zip([(member, "Manifest-Version: 1.0\n"), ("readme.txt", "hola")])
+            self.assertEqual(kind(buf), ("zip", "zip"), member)
+            self.assertTrue(filemagic.index().matches(filemagic.identify(buf.getvalue()[:512], buf), ".zip"))
+
+    def test_jar_and_apk_need_their_structure(self):
+        jar = make_zip([("META-INF/MANIFEST.MF", "Manifest-Version: 1.0\n"), ("a/Main.class", b"\xca\xfe\xba\xbe")])
+        apk = make_zip([("AndroidManifest.xml", b"\x03\x00"), ("classes.dex", b"dex\n035\x00")])
+        self.assertEqual(kind(jar)[1], "jar")
+        self.assertEqual(kind(apk)[1], "apk")
+
+    def test_ooxml_from_member_names(self):
+        docx = make_zip([("[Content_Types].xml", "<Types/>"), ("word/document.xml", "<w/>")])
+        self.assertEqual(kind(docx), ("docx", "docx"))
+        outer = make_zip([("inner.docx", docx.getvalue())], zipfile.ZIP_STORED)
+        self.assertEqual(kind(outer), ("zip", "zip"))
+        folder = make_zip([("keyword/xl/a.txt", "x")])
+        self.assertEqual(kind(folder), ("zip", "zip"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import guardex_gui
+except ImportError:
+    guardex_gui = None
+
+
+@unittest.skipIf(guardex_gui is None, "guardex_gui necesita customtkinter y PIL")
+class ManifestNamesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "datos")
+        os.makedirs(self.root)
+        self.bad = os.fsdecode(b"bad\xff.bin")
+        with open(os.path.join(self.root, self.bad), "wb") as f: f.write(b"hola")
+        with open(os.path.join(self.root, "ok.txt"), "wb") as f: f.write(b"adios")
+        self.out = os.path.join(self.tmp.name, "manifest.tsv")
+        self.logic = guardex_gui.GuardexLogic()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_non_utf8_name_round_trips(self):
+        r = self.logic.build_manifest(self.root, self.out, workers=1)
+        self.assertEqual(r["files"], 2)
+        self.assertFalse(os.path.exists(self.out + ".tmp"))
+        m = self.logic.load_manifest(self.out)
+        self.assertEqual(sorted(m["entries"]), sorted([self.bad, "ok.txt"]))
+        self.logic.save_manifest(m, self.out)
+        self.assertEqual(self.logic.load_manifest(self.out)["entries"], m["entries"])
+        v = self.logic.verify(self.root, self.out, workers=1)
+        self.assertTrue(v["ok"])
+        old = guardex_gui.REPORT_DIR
+        guardex_gui.REPORT_DIR = os.path.join(self.tmp.name, "reports")
+        try:
+            with open(self.logic.save_report(v), encoding="utf-8") as f: self.assertEqual(json.load(f)["folder"], v["folder"])
+        finally:
+            guardex_gui.REPORT_DIR = old
+
+    def test_failed_write_removes_tmp(self):
+        def boom(e, algos): raise OSError("disco lleno")
+        self.logic.manifest_line = boom
+        with self.assertRaises(OSError): self.logic.build_manifest(self.root, self.out, workers=1)
+        self.assertFalse(os.path.exists(self.out + ".tmp"))
+        self.assertFalse(os.path.exists(self.out))
+
+
+if __name__ == "__main__":
+    unittest.main()
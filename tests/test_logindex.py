@@ -0,0 +1,61 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import logsearch
+import logindex
+
+
+class LogIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.logs = os.path.join(self.dir, "logs")
+        os.makedirs(self.logs)
+        self.ix = logindex.LogIndex(os.path.join(self.dir, "index.db"))
+
+    def tearDown(self):
+        self.ix.close()
+        shutil.rmtree(self.dir)
+
+    def write(self, name, data, mode="wb"):
+        with open(os.path.join(self.logs, name), mode) as f: f.write(data)
+
+    def hits(self, kw, **kw_args):
+        self.ix.update(self.logs)
+        return [(os.path.basename(h["path"]), h["line"], h["text"]) for h in self.ix.query(kw, folder=self.logs, **kw_args)]
+
+    def scan(self, kw):
+        return [(os.path.basename(h["path"]), h["line"], h["text"]) for h in logsearch.search(self.logs, [kw], ignore_case=True, workers=1)]
+
+    def test_unterminated_last_line(self):
+        self.write("a.log", b"error one\nok\nerror three")
+        self.assertEqual(self.hits("error"), [("a.log", 1, "error one"), ("a.log", 3, "error three")])
+        self.assertEqual(self.hits("error"), self.scan("error"))
+        self.assertEqual(self.ix.update(self.logs)["indexed"], 0)
+        self.write("a.log", b"more\nerror five\n", "ab")
+        self.assertEqual(self.hits("error"), self.scan("error"))
+        self.assertEqual([h[1] for h in self.hits("error")], [1, 3, 4])
+        self.assertEqual(self.hits("threemore"), [("a.log", 3, "error threemore")])
+
+    def test_line_longer_than_chunk(self):
+        old = logindex.CHUNK
+        logindex.CHUNK = 16
+        try:
+            self.write("b.log", b"ok\n" + b"x" * 40 + b" error long\nerror short\n" + b"y" * 50 + b" error")
+            self.assertEqual(self.hits("error"), self.scan("error"))
+            self.assertEqual([h[1] for h in self.hits("error")], [2, 3, 4])
+        finally:
+            logindex.CHUNK = old
+
+    def test_prefix_and_substring(self):
+        self.write("c.log", b"connection refused\nterror level\n")
+        self.assertEqual([h[1] for h in self.hits("connect")], [1])
+        self.assertEqual(self.hits("rror"), [])
+        self.assertEqual([h[1] for h in self.hits("rror", substring=True)], [2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import logsearch
+
+RANGES = [997, 4096, 65536, logsearch.RANGE_BYTES]
+
+
+def write_logs(folder):
+    os.makedirs(os.path.join(folder, "sub"))
+    with open(os.path.join(folder, "app.log"), "w", newline="") as f:
+        for i in range(20000):
+            if i % 97 == 0: f.write(f"2024-01-01 ERROR code {i} failed\n")
+            elif i % 131 == 0: f.write(f"2024-01-01 warn Error retry {i}\r\n")
+            else: f.write(f"2024-01-01 INFO request {i} ok\n")
+    with open(os.path.join(folder, "sub", "tail.txt"), "w") as f:
+        f.write("first line\n" * 5000 + "last ERROR without newline")
+    open(os.path.join(folder, "empty.log"), "w").close()
+
+
+def reference(folder, patterns, ignore_case):
+    out = []
+    for path, _ in logsearch.iter_files(folder):
+        with open(path, "rb") as f: lines = f.read().split(b"\n")
+        for n, line in enumerate(lines, 1):
+            hay = line.lower() if ignore_case else line
+            if any((p.lower() if ignore_case else p).encode() in hay for p in patterns):
+                out.append((path, n, line.rstrip(b"\r").decode()))
+    return out
+
+
+class SearchTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        write_logs(self.dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def run_search(self, patterns, **kw):
+        return [(h["path"], h["line"], h["text"], h["pattern"]) for h in logsearch.search(self.dir, patterns, workers=1, **kw)]
+
+    def test_ranges_match_reference(self):
+        for patterns, ignore_case in ((["ERROR"], False), (["error", "retry"], True)):
+            expected = reference(self.dir, patterns, ignore_case)
+            first = None
+            for rb in RANGES:
+                got = self.run_search(patterns, ignore_case=ignore_case, range_bytes=rb)
+                self.assertEqual([h[:3] for h in got], expected, (patterns, rb))
+                if first is None: first = got
+                self.assertEqual(got, first, (patterns, rb))
+
+    def test_regex_ranges_agree(self):
+        results = [self.run_search([r"code \d+", r"retry \d+$"], regex=True, range_bytes=rb) for rb in RANGES]
+        self.assertTrue(results[0])
+        for got in results[1:]: self.assertEqual(got, results[0])
+
+    def test_small_ranges_scan_each_byte_once(self):
+        path = os.path.join(self.dir, "big.log")
+        with open(path, "w") as f:
+            f.write("FATAL boot\n")
+            f.write("INFO nothing to report here\n" * 150000)
+        size = os.path.getsize(path)
+        scanned = []
+        load, init, count = logsearch.LiteralFinder.load, logsearch.RegexFinder.__init__, logsearch.count_lines
+        def load_spy(self, w0, end):
+            load(self, w0, end)
+            if self.lower: scanned.append(len(self.win))
+        class RegexSpy:
+            def __init__(self, rx): self.rx = rx
+            def search(self, buf, pos, endpos):
+                scanned.append(endpos - pos)
+                return self.rx.search(buf, pos, endpos)
+        def init_spy(self, buf, rx, rxs, size):
+            init(self, buf, RegexSpy(rx), rxs, size)
+        def count_spy(buf, start, end):
+            scanned.append(end - start)
+            return count(buf, start, end)
+        logsearch.LiteralFinder.load, logsearch.RegexFinder.__init__, logsearch.count_lines = load_spy, init_spy, count_spy
+        try:
+            for spec in ((("fatal",), False, True), ((r"\bfatal\b",), True, True)):
+                step = size // 256 + 1
+                del scanned[:]
+                hits = sum(len(logsearch.search_range(path, a, min(a + step, size), spec)[1]) for a in range(0, size, step))
+                self.assertEqual(hits, 1)
+                self.assertLessEqual(sum(scanned), 2 * size + 257 * 2 * logsearch.MAX_LINE, spec)
+        finally:
+            logsearch.LiteralFinder.load, logsearch.RegexFinder.__init__, logsearch.count_lines = load, init, count
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import customtkinter as ctk
+
+ROW_HEIGHT = 22
+VISIBLE_ROWS = 18
+WHEEL_ROWS = 3
+FILTER_DELAY = 150
+COLOR_ROW = "#252526"
+COLOR_HEAD = "#2B2B2B"
+
+
+def sort_key(v):
+    try: return (0, float(v), "")
+    except (TypeError, ValueError): return (1, 0.0, str(v).lower())
+
+
+class VirtualTable(ctk.CTkFrame):
+    def __init__(self, parent, columns, rows=VISIBLE_ROWS, row_height=ROW_HEIGHT, filter_box=True, on_select=None, **kw):
+        super().__init__(parent, **kw)
+        self.columns = [dict({"width": 0, "max": 0, "font": ("Roboto", 10), "color": "#DDD"}, **c) for c in columns]
+        self.max_rows = rows
+        self.row_height = row_height
+        self.data = []
+        self.view = []
+        self.top = 0
+        self.sort_col = None
+        self.sort_desc = False
+        self.query = ""
+        self.pool = []
+        self.after_id = None
+        self.on_select = on_select
+
+        if filter_box:
+            self.ent = ctk.CTkEntry(self, placeholder_text="Filtrar...", height=26)
+            self.ent.pack(fill="x", padx=4, pady=(4, 2))
+            self.ent.bind("<KeyRelease>", self.on_filter)
+
+        head = ctk.CTkFrame(self, fg_color=COLOR_HEAD, corner_radius=0)
+        head.pack(fill="x")
+        self.head_btns = []
+        for i, c in enumerate(self.columns):
+            b = ctk.CTkButton(head, text=c["title"], width=c["width"] or 120, height=22, anchor="w", corner_radius=0,
+                              fg_color="transparent", hover_color="#333", font=("Roboto", 10, "bold"), text_color="gray",
+                              command=lambda i=i: self.sort_by(i))
+            b.pack(side="left", fill="x", expand=not c["width"], padx=(4, 0))
+            self.head_btns.append(b)
+
+        self.body = ctk.CTkFrame(self, fg_color="transparent", corner_radius=0)
+        self.body.pack(fill="both", expand=True)
+        self.sb = ctk.CTkScrollbar(self.body, command=self.yview)
+        self.sb.pack(side="right", fill="y")
+        self.rows_fr = ctk.CTkFrame(self.body, fg_color="transparent", corner_radius=0)
+        self.rows_fr.pack(side="left", fill="both", expand=True)
+        self.lbl_empty = ctk.CTkLabel(self.rows_fr, text="Sin resultados.", text_color="gray")
+        self.bind_wheel(self.rows_fr)
+
+    def bind_wheel(self, w):
+        w.bind("<MouseWheel>", lambda e: self.scroll(-WHEEL_ROWS if e.delta > 0 else WHEEL_ROWS) or "break")
+        w.bind("<Button-4>", lambda e: self.scroll(-WHEEL_ROWS) or "break")
+        w.bind("<Button-5>", lambda e: self.scroll(WHEEL_ROWS) or "break")
+
+    def build_pool(self, n):
+        for row, cells in self.pool: row.destroy()
+        self.pool = []
+        for i in range(n):
+            row = ctk.CTkFrame(self.rows_fr, height=self.row_height, corner_radius=0, fg_color="transparent")
+            row.pack(fill="x")
+            row.pack_propagate(False)
+            cells = []
+            for c in self.columns:
+                lbl = ctk.CTkLabel(row, text="", width=c["width"] or 0, height=self.row_height, anchor="w", font=c["font"], text_color=c["color"])
+                lbl.pack(side="left", fill="x", expand=not c["width"], padx=8)
+                self.bind_wheel(lbl)
+                if self.on_select: lbl.bind("<Button-1>", lambda e, i=i: self.select(i))
+                cells.append(lbl)
+            self.bind_wheel(row)
+            self.pool.append((row, cells))
+
+    def set_rows(self, rows):
+        self.data = [tuple("" if v is None else str(v) for v in r) for r in rows]
+        n = min(self.max_rows, len(self.data))
+        if n != len(self.pool): self.build_pool(n)
+        self.refresh()
+
+    def on_filter(self, e=None):
+        if self.after_id: self.after_cancel(self.after_id)
+        self.after_id = self.after(FILTER_DELAY, self.set_filter, self.ent.get())
+
+    def set_filter(self, text):
+        self.after_id = None
+        self.query = text.strip().lower()
+        self.refresh()
+
+    def sort_by(self, col):
+        if self.sort_col == col: self.sort_desc = not self.sort_desc
+        else: self.sort_col, self.sort_desc = col, False
+        for i, b in enumerate(self.head_btns):
+            mark = (" ▼" if self.sort_desc else " ▲") if i == self.sort_col else ""
+            b.configure(text=self.columns[i]["title"] + mark)
+        self.refresh()
+
+    def refresh(self):
+        idx = range(len(self.data))
+        if self.query: idx = [i for i in idx if any(self.query in v.lower() for v in self.data[i])]
+        if self.sort_col is not None:
+            col = self.sort_col
+            idx = sorted(idx, key=lambda i: sort_key(self.data[i][col]), reverse=self.sort_desc)
+        self.view = list(idx)
+        self.top = 0
+        if self.view or not self.pool: self.lbl_empty.place_forget()
+        else: self.lbl_empty.place(relx=0.5, rely=0.5, anchor="center")
+        self.render()
+
+    def render(self):
+        for i, (row, cells) in enumerate(self.pool):
+            k = self.top + i
+            vals = self.data[self.view[k]] if k < len(self.view) else None
+            row.configure(fg_color=COLOR_ROW if vals and k % 2 == 0 else "transparent")
+            for j, (c, lbl) in enumerate(zip(self.columns, cells)):
+                v = vals[j] if vals else ""
+                if c["max"] and len(v) > c["max"]: v = v[:c["max"]] + ".."
+                lbl.configure(text=v)
+        n = len(self.view)
+        if n <= len(self.pool): self.sb.set(0.0, 1.0)
+        else: self.sb.set(self.top / n, (self.top + len(self.pool)) / n)
+
+    def select(self, i):
+        if self.top + i < len(self.view): self.on_select(self.view[self.top + i])
+
+    def max_top(self):
+        return max(0, len(self.view) - len(self.pool))
+
+    def scroll(self, n):
+        top = min(max(0, self.top + n), self.max_top())
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def yview(self, *args):
+        if args[0] == "moveto": self.scroll(int(round(float(args[1]) * len(self.view))) - self.top)
+        elif args[0] == "scroll": self.scroll(int(args[1]) * (len(self.pool) if args[2] == "pages" else 1))